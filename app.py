@@ -0,0 +1,159 @@
+import os
+import json
+import numpy as np
+import image_to_text
+import extract_item
+import extract_item2
+from ocr_record import build_record, record_lines, save_record, save_text_view
+from process_text import get_processor
+from correction_cache import DEFAULT_CACHE_PATH as DEFAULT_CORRECTION_CACHE_PATH
+from receipt_tokens import tokenize_lines
+
+"""
+영수증 분석 라이브러리 진입점
+- 이미지(바이트 또는 RGB 배열) → OCR → 텍스트 후처리 → 메뉴 추출 → 영수증 dict를 메모리 안에서 처리
+- 단계마다 파일로 쓰고 다시 읽는 스크립트 흐름(ocr_raw_txt → ocr_processed_txt → json)과 같은 결과
+- 파일 저장은 save=True일 때만 (스크립트 흐름과 같은 폴더/파일명)
+- 캐시(OCR 캐시, 단어 교정 캐시, 사전 아티팩트)도 기본으로 사용하지 않음 (인자로 켰을 때만 파일 생성)
+"""
+
+OUTPUT_DIR = "output"
+POSTPROCESS_DICT_PATH = "dictionary.txt"  # 텍스트 후처리(단어 교정) 사전
+EXTRACT_METHODS = {
+    "dictionary": "사전(유사도) 기반 (extract_item2)",
+    "pattern": "패턴 기반 (extract_item)",
+}
+
+
+def _processor_options(correction_cache_path=None, use_artifact=False):
+    """후처리기 생성 인자 (기본값은 교정 캐시/사전 아티팩트 파일을 만들지 않음)"""
+    return {"correction_cache_path": correction_cache_path, "use_artifact": use_artifact}
+
+
+def warmup(dict_path=extract_item2.DICT_PATH, correction_cache_path=None, use_artifact=False):
+    """장시간 실행 서비스용 - OCR 모델, 후처리 사전, 가게/메뉴 사전을 미리 로드 (analyze_receipt와 같은 옵션으로)"""
+    image_to_text.warmup()
+    options = _processor_options(correction_cache_path, use_artifact)
+    get_processor(POSTPROCESS_DICT_PATH, **options)
+    get_processor(dict_path, **options)
+
+
+def build_receipt(name, store_name, menu_items):
+    """추출 결과를 영수증 dict로 변환 (extract_item*.process_txt_files가 저장하는 JSON과 같은 형식)"""
+    try:
+        total_amount = sum(int(item["amount"]) for item in menu_items)  # 모든 메뉴 금액 합
+    except (KeyError, ValueError):
+        total_amount = 0
+    return {
+        "filename": name,
+        "store_name": store_name,
+        "items": menu_items,
+        "total_amount": total_amount,
+    }
+
+
+def analyze_lines(lines, name="receipt", method="dictionary", dict_path=extract_item2.DICT_PATH,
+                  correction_cache_path=None, use_artifact=False):
+    """
+    OCR 원본 텍스트 줄 → 영수증 dict (후처리 + 메뉴 추출)
+    correction_cache_path: 단어 교정 캐시 파일 (None이면 사용 안 함)
+    use_artifact: True면 사전 아티팩트를 output/dictionary_cache/에 만들어서 사용
+    반환: (영수증 dict, 후처리된 줄 목록)
+    """
+    if method not in EXTRACT_METHODS:
+        raise ValueError(f"지원하지 않는 추출 방식: {method} (가능: {', '.join(EXTRACT_METHODS)})")
+
+    options = _processor_options(correction_cache_path, use_artifact)
+    processed_lines = get_processor(POSTPROCESS_DICT_PATH, **options).process_lines(list(lines))
+    token_lines = tokenize_lines(processed_lines)  # 줄마다 한 번만 토큰화
+    if method == "dictionary":
+        store_name, menu_items = extract_item2.extract_menu_items_from_lines(token_lines, dict_path, **options)
+    else:
+        store_name, menu_items = extract_item.extract_menu_items_from_lines(token_lines)
+    return build_receipt(name, store_name, menu_items), processed_lines
+
+
+def _read_image(image):
+    """이미지 입력 → (바이트 또는 None, RGB 배열 또는 None)"""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image), None
+    if isinstance(image, np.ndarray):
+        return None, image
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, 'rb') as f:
+            return f.read(), None
+    raise TypeError(f"이미지는 바이트, RGB 배열 또는 파일 경로여야 함: {type(image).__name__}")
+
+
+def analyze_receipt(image, name="receipt", method="dictionary", dict_path=extract_item2.DICT_PATH,
+                    min_confidence=0.0, save=False, output_dir=OUTPUT_DIR, use_cache=False,
+                    correction_cache_path=None, use_artifact=False):
+    """
+    영수증 이미지 하나를 분석해서 영수증 dict 반환 (기본값으로는 파일을 전혀 쓰지 않음)
+    image: 이미지 파일 바이트, RGB 배열 (H, W, 3) 또는 파일 경로
+    name: 영수증 이름 (결과의 "filename", save=True일 때 파일명)
+    method: "dictionary"(extract_item2) 또는 "pattern"(extract_item)
+    min_confidence: 이 값 미만인 OCR 토큰은 후처리 전에 제외
+    save: True면 레코드/원본 텍스트/후처리 텍스트/JSON을 스크립트 흐름과 같은 위치에 저장
+    use_cache: True면 OCR 캐시(output/ocr_cache/) 사용 (바이트/경로 입력만, 배열은 캐시 키가 없으므로 항상 OCR 수행)
+    correction_cache_path: 단어 교정 캐시 파일 (None이면 사용 안 함)
+    use_artifact: True면 사전 아티팩트를 output/dictionary_cache/에 만들어서 사용
+    """
+    image_bytes, image_array = _read_image(image)
+    if image_bytes is not None:
+        result = image_to_text.run_ocr(image_bytes, use_cache=use_cache)  # 캐시에 있으면 디코딩/OCR 생략
+    else:
+        result = image_to_text.readtext_image(image_array)
+
+    order, line_ids = image_to_text.group_lines(result)  # 텍스트 줄 단위 그룹화
+    record = build_record(name, result, order, line_ids)
+    receipt, processed_lines = analyze_lines(record_lines(record, min_confidence), name, method, dict_path,
+                                             correction_cache_path, use_artifact)
+
+    if save:
+        save_receipt(output_dir, name, record, processed_lines, receipt)
+    return receipt
+
+
+def save_receipt(output_dir, name, record, processed_lines, receipt):
+    """분석 중간/최종 결과를 스크립트 흐름과 같은 폴더 구조로 저장"""
+    paths = {
+        "ocr_records": os.path.join(output_dir, "ocr_records", f"{name}.jsonl"),
+        "ocr_raw_txt": os.path.join(output_dir, "ocr_raw_txt", f"{name}_raw.txt"),
+        "ocr_processed_txt": os.path.join(output_dir, "ocr_processed_txt", f"{name}_processed.txt"),
+        "json": os.path.join(output_dir, "json", f"{name}.json"),
+    }
+    for path in paths.values():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    save_record(paths["ocr_records"], record)
+    save_text_view(paths["ocr_raw_txt"], record)
+    with open(paths["ocr_processed_txt"], 'w', encoding='utf-8') as f:
+        f.write('\n'.join(processed_lines))
+    if receipt["items"]:  # 스크립트 흐름과 같이 메뉴 항목이 있을 때만 JSON 저장
+        with open(paths["json"], 'w', encoding='utf-8') as f:
+            json.dump(receipt, f, ensure_ascii=False, indent=2)
+    return paths
+
+
+# 메인 실행 (이미지 하나 분석 후 결과 출력)
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="영수증 이미지 분석 (OCR → 후처리 → 메뉴 추출, 메모리 안에서 처리)")
+    parser.add_argument("image", help="영수증 이미지 파일")
+    parser.add_argument("--method", choices=list(EXTRACT_METHODS), default="dictionary", help="메뉴 추출 방식")
+    parser.add_argument("--dict", default=extract_item2.DICT_PATH,
+                        help="가게/메뉴 사전 (JSON 또는 .sqlite3 카탈로그, dictionary 방식에서 사용)")
+    parser.add_argument("--min-confidence", type=float, default=0.0,
+                        help="이 값 미만인 OCR 토큰은 후처리 전에 제외")
+    parser.add_argument("--save", action="store_true", help="중간/최종 결과를 output 폴더에 저장")
+    parser.add_argument("--cache", action="store_true",
+                        help="OCR 캐시, 단어 교정 캐시, 사전 아티팩트를 output 폴더에 만들어서 사용")
+    args = parser.parse_args()
+
+    name = os.path.splitext(os.path.basename(args.image))[0]
+    receipt = analyze_receipt(args.image, name, args.method, args.dict, args.min_confidence, args.save,
+                              use_cache=args.cache,
+                              correction_cache_path=DEFAULT_CORRECTION_CACHE_PATH if args.cache else None,
+                              use_artifact=args.cache)
+    print(json.dumps(receipt, ensure_ascii=False, indent=2))
@@ -0,0 +1,103 @@
+import os
+import re
+import io
+import time
+import random
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from process_text import TextPostProcessor
+
+"""
+find_closest_word 성능 비교 도구
+- 기본 사전(dictionary.txt) + 임의로 만든 한글 단어로 큰 사전 생성
+- 전체 순회(use_index=False)와 자모 서명 인덱스(use_index=True) 결과/시간 비교
+- 질의 전체를 한 번에 교정하는 correct_words(고유 단어 × 사전 유사도 행렬)도 함께 비교
+"""
+
+COMMON_SYLLABLES = "가각간갈감강개거건결경계고공과관광교구국군권금기김나남내노다단달담당대도동두라람랑래로료리마만말매명모무문물미바박반방배번법변보복본부분비사산삼상생서선설성세소속손송수순시식신실심아안알암애약양어업여역연영예오온와외요용우운원월위유육은을음의이인일임입자작장재저전점정제조종주중지진차착찬참창채책처천철청체초총최추축출충치카타탕태토통파판패페평포표품프피하학한할함합항해행향허현형호화환활회효후휴흥"
+
+
+def build_vocabulary(base_words, size, rng):
+    """기본 사전 단어 + 임의 한글 단어로 size개짜리 사전 생성"""
+    vocabulary = list(base_words)
+    seen = set(vocabulary)
+    while len(vocabulary) < size:
+        word = ''.join(rng.choice(COMMON_SYLLABLES) for _ in range(rng.randint(2, 7)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+
+def build_queries(vocabulary, raw_dir, count, rng):
+    """OCR 원본 텍스트의 한글 단어 + 사전 단어 한 글자 변형으로 질의 목록 생성"""
+    queries = []
+    if os.path.isdir(raw_dir):
+        for filename in sorted(os.listdir(raw_dir)):
+            if filename.endswith('.txt'):
+                with open(os.path.join(raw_dir, filename), 'r', encoding='utf-8') as f:
+                    for word in f.read().split():
+                        if not re.search(r'\d', word) and re.search(r'[가-힣]', word) and len(word) > 1:
+                            queries.append(word)
+
+    while len(queries) < count:
+        word = list(rng.choice(vocabulary))
+        word[rng.randrange(len(word))] = rng.choice(COMMON_SYLLABLES)  # OCR 오인식 흉내
+        queries.append(''.join(word))
+    return queries[:count]
+
+
+def run(processor, queries, use_index):
+    results = []
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):  # 교정 로그 출력 생략
+        for word in queries:
+            results.append(processor.find_closest_word(word, use_index=use_index))
+    return results, time.perf_counter() - start
+
+
+def run_batch(processor, queries):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        corrections = processor.correct_words(queries)
+    return [corrections.get(word) for word in queries], time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="find_closest_word 선형 탐색 vs 인덱스 비교")
+    parser.add_argument("--vocab", type=int, default=20000, help="사전 단어 수")
+    parser.add_argument("--queries", type=int, default=300, help="질의 단어 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open("dictionary.txt", 'r', encoding='utf-8') as f:
+        base_words = [line.strip() for line in f if line.strip()]
+    vocabulary = build_vocabulary(base_words, args.vocab, rng)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+        f.write('\n'.join(vocabulary))
+        dict_path = f.name
+
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            processor = TextPostProcessor(dict_path=dict_path, use_artifact=False, correction_cache_path=None)
+        print(f"사전 {len(vocabulary)}개 로드 + 인덱스 생성: {time.perf_counter() - start:.2f}초")
+    finally:
+        os.remove(dict_path)
+
+    queries = build_queries(vocabulary, os.path.join("output", "ocr_raw_txt"), args.queries, rng)
+    linear_results, linear_time = run(processor, queries, use_index=False)
+    index_results, index_time = run(processor, queries, use_index=True)
+    batch_results, batch_time = run_batch(processor, queries)
+
+    mismatches = sum(1 for a, b in zip(linear_results, index_results) if a != b)
+    batch_mismatches = sum(1 for a, b in zip(linear_results, batch_results) if a != b)
+    print(f"질의 {len(queries)}개 (고유 단어 {len(set(queries))}개)")
+    print(f"  선형 탐색: {linear_time:.3f}초 ({linear_time / len(queries) * 1000:.2f}ms/단어)")
+    print(f"  인덱스  : {index_time:.3f}초 ({index_time / len(queries) * 1000:.2f}ms/단어)")
+    print(f"  일괄 교정: {batch_time:.3f}초 ({batch_time / len(queries) * 1000:.2f}ms/단어)")
+    print(f"  속도 향상: 인덱스 {linear_time / max(index_time, 1e-9):.1f}배 (불일치 {mismatches}개), "
+          f"일괄 {linear_time / max(batch_time, 1e-9):.1f}배 (불일치 {batch_mismatches}개)")
@@ -0,0 +1,93 @@
+import os
+import time
+import json
+import random
+import argparse
+import tempfile
+from process_text import TextPostProcessor, STORE_SHORTLIST_SIZE
+from benchmark_text_rules import load_corpus_lines
+
+"""
+가게명 매칭 성능 비교 도구
+- dictionary_store_item.json의 가게에 임의 가게명을 더해 큰 가게 목록을 만들고
+  전체 비교(JamoWordIndex)와 n-gram 역색인 후보 비교의 결과/시간 비교
+- 질의: OCR 원본 줄/단어 (extract_item2의 가게 찾기와 같은 입력) + 가게명을 조금 바꾼 문자열
+"""
+
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호대학교커피빵집점역본관동서남북")
+
+
+def random_store_name(rng):
+    words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(1, 2))]
+    return ' '.join(words)
+
+
+def mutate_name(name, rng):
+    """OCR 오인식 흉내: 글자 하나를 바꾸거나 지움"""
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    if rng.random() < 0.5 and len(chars) > 2:
+        del chars[i]
+    else:
+        chars[i] = rng.choice(SYLLABLES)
+    return ''.join(chars)
+
+
+def timed(processor, queries, shortlist):
+    """질의별 (결과, 소요 시간) 목록"""
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        match = processor.find_best_store_match(query, shortlist=shortlist)
+        results.append((match, time.perf_counter() - start))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가게명 매칭: 전체 비교 vs n-gram 역색인 후보 비교")
+    parser.add_argument("--stores", type=int, nargs="+", default=[1000, 5000, 20000], help="가게 목록 크기")
+    parser.add_argument("--queries", type=int, default=2000, help="질의 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open("dictionary_store_item.json", 'r', encoding='utf-8') as f:
+        base_stores = json.load(f)["stores"]
+    corpus = load_corpus_lines(os.path.join("output", "ocr_raw_txt"))
+    rng = random.Random(args.seed)
+
+    for size in args.stores:
+        stores = dict(base_stores)
+        while len(stores) < size:
+            stores.setdefault(random_store_name(rng), {"items": []})
+        names = list(stores)
+
+        queries, kinds = [], []
+        for _ in range(args.queries):
+            if rng.random() < 0.5:
+                line = rng.choice(corpus)
+                queries.append(rng.choice([line] + line.split()))
+                kinds.append("OCR 줄/단어")
+            else:
+                queries.append(mutate_name(rng.choice(names), rng))
+                kinds.append("가게명 변형")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stores.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"stores": stores}, f, ensure_ascii=False)
+            processor = TextPostProcessor(dict_path=path, use_artifact=False, correction_cache_path=None)
+
+            # 역색인 생성 시간은 측정에서 제외
+            processor.find_best_store_match("가나다라", shortlist=None)
+            processor.find_best_store_match("가나다라")
+            exact = timed(processor, queries, None)
+            shortlisted = timed(processor, queries, STORE_SHORTLIST_SIZE)
+
+        print(f"가게 {size:,}개, 질의 {len(queries)}개")
+        for kind in ("가게명 변형", "OCR 줄/단어"):
+            rows = [(a, b) for a, b, k in zip(exact, shortlisted, kinds) if k == kind]
+            exact_time = sum(a[1] for a, _ in rows)
+            shortlist_time = sum(b[1] for _, b in rows)
+            same = sum(a[0][0] == b[0][0] for a, b in rows)
+            print(f"  {kind}: 전체 비교 {exact_time * 1000:.1f}ms, n-gram 후보 {shortlist_time * 1000:.1f}ms "
+                  f"({exact_time / max(shortlist_time, 1e-9):.1f}배), 결과 일치 {same}/{len(rows)}")
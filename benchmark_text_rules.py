@@ -0,0 +1,120 @@
+import os
+import re
+import time
+import random
+import argparse
+from text_rules import load_rules
+
+"""
+텍스트 보정 규칙 엔진 검증/성능 비교 도구
+- 기존 방식(규칙마다 re.sub 한 번씩, 20여 회)과 text_rules.json 컴파일 엔진(단계별 한 번의 스캔) 비교
+- OCR 원본 텍스트 전체 줄 + 임의 변형 줄에서 결과가 바이트 단위로 같은지 확인
+"""
+
+FUZZ_CHARS = list("0123456789") * 4 + list(" ,.:;lIOUEC()\t가a")
+
+
+def legacy_clean(text):
+    """기존 clean_text의 단어 교정 전 단계"""
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'(\d+)l(\d+)', r'\g<1>1\g<2>', text)
+    text = re.sub(r'(\d+)I(\d+)', r'\g<1>1\g<2>', text)
+    text = re.sub(r';', ':', text)
+    text = re.sub(r'([^\s]):([^\s])', r'\1 : \2', text)
+    text = re.sub(r'([^\s]):', r'\1 :', text)
+    text = re.sub(r':([^\s])', r': \1', text)
+    return text
+
+
+def legacy_normalize(text):
+    """기존 normalize_number"""
+    text = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d+)O\b', r'\g<1>0', text)
+    text = re.sub(r'\bO(\d+)', r'0\g<1>', text)
+    text = re.sub(r'(\d*[,\.])O(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)U(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)E(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d+)E\b', r'\g<1>0', text)
+    text = re.sub(r'\bE(\d+)', r'0\g<1>', text)
+    text = re.sub(r'(\d*[,\.])E(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)C(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d+)C\b', r'\g<1>0', text)
+    text = re.sub(r'\bC(\d+)', r'0\g<1>', text)
+    text = re.sub(r'(\d*[,\.])C(\d*)', r'\g<1>0\g<2>', text)
+    text = re.sub(r'(\d*)\((\d*)', r'\1\2', text)
+    text = re.sub(r'(\d*)\)(\d*)', r'\1\2', text)
+    text = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', text)
+    text = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', text)
+    text = re.sub(r'(\d{1,3})\.(\d{3})(?!\d)', r'\1,\2', text)
+
+    def handle_number_spacing(match):
+        num1, num2 = match.group(1), match.group(2)
+        if len(num1) < 3 and len(num2) == 3:
+            return f"{num1},{num2}"
+        elif len(num1) == 3 and len(num2) == 3:
+            return f"{num1},{num2}" if num2 == "000" else f"{num1} {num2}"
+        return f"{num1},{num2}"
+
+    return re.sub(r'(\d{1,3})\s+(\d{3})(?!\d)', handle_number_spacing, text)
+
+
+def load_corpus_lines(raw_dir):
+    lines = []
+    for filename in sorted(os.listdir(raw_dir)):
+        if filename.endswith('.txt'):
+            with open(os.path.join(raw_dir, filename), 'r', encoding='utf-8') as f:
+                lines.extend(line.rstrip('\n') for line in f if line.strip())
+    return lines
+
+
+def mutate(line, rng):
+    """OCR 오인식 흉내: 숫자/구분자/혼동 문자를 몇 개 바꾸거나 넣거나 지움"""
+    chars = list(line)
+    for _ in range(rng.randint(1, 3)):
+        if not chars:
+            break
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice(FUZZ_CHARS)
+        elif op < 0.7:
+            chars.insert(i, rng.choice(FUZZ_CHARS))
+        else:
+            del chars[i]
+    return ''.join(chars)
+
+
+def timed(function, lines, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [function(line) for line in lines]
+    return results, (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="텍스트 보정: 기존 re.sub 연쇄 vs 컴파일된 규칙 엔진")
+    parser.add_argument("--fuzz", type=int, default=50000, help="임의 변형 줄 수")
+    parser.add_argument("--repeat", type=int, default=20, help="시간 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rules = load_rules()
+    clean, normalize = rules["clean"].apply, rules["normalize"].apply
+
+    corpus = load_corpus_lines(os.path.join("output", "ocr_raw_txt"))
+    rng = random.Random(args.seed)
+    fuzz = [mutate(rng.choice(corpus), rng) for _ in range(args.fuzz)]
+
+    for name, lines in (("OCR 원본", corpus), ("임의 변형", fuzz)):
+        mismatches = [line for line in lines
+                      if clean(line) != legacy_clean(line)
+                      or normalize(legacy_clean(line)) != legacy_normalize(legacy_clean(line))]
+        print(f"{name} {len(lines)}줄: 결과 불일치 {len(mismatches)}개")
+        for line in mismatches[:5]:
+            print(f"  {line!r}")
+
+    _, legacy_time = timed(lambda line: legacy_normalize(legacy_clean(line)), corpus, args.repeat)
+    _, engine_time = timed(lambda line: normalize(clean(line)), corpus, args.repeat)
+    print(f"OCR 원본 {len(corpus)}줄 정리+숫자 보정 (평균 {args.repeat}회)")
+    print(f"  기존 re.sub 연쇄: {legacy_time * 1000:.2f}ms")
+    print(f"  규칙 엔진      : {engine_time * 1000:.2f}ms ({legacy_time / max(engine_time, 1e-9):.1f}배)")
@@ -0,0 +1,155 @@
+import os
+import time
+import sqlite3
+from lru import LRUCache
+
+"""
+단어 교정 결과 캐시 모듈
+- OCR 단어 → 교정 단어(또는 "교정 없음")를 SQLite에 저장해서 실행/프로세스 간 공유
+- 사전 버전(원본 사전 해시)과 임계값이 키에 포함되므로 사전이 바뀌면 자동으로 다른 항목 사용
+- 프로세스 안에서는 최근 사용한 항목을 메모리에 보관 (반복 조회는 해시 조회 한 번, 항목 수 상한 있음)
+- 항목 수가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+  (행 수는 저장한 만큼 더해서 추정하고, 추정치가 상한을 넘을 때만 실제로 세어서 정리)
+- 캐시 파일을 만들거나 쓸 수 없으면 경고 후 SQLite 없이 메모리 캐시만 사용 (후처리는 계속 진행)
+"""
+
+DEFAULT_CACHE_PATH = os.path.join("output", "correction_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_MAX_MEMORY_ENTRIES = 50_000  # 프로세스 메모리에 보관할 최대 항목 수
+CACHE_VERSION = 1  # 유사도 계산/교정 규칙이 바뀌면 올려서 기존 항목 무효화
+SQLITE_MAX_VARIABLES = 900  # 한 번의 IN (...) 조회에 넣을 최대 단어 수
+EVICT_TARGET_RATIO = 0.9  # 정리할 때 상한의 이 비율까지 줄임 (상한 근처에서 저장할 때마다 정리하지 않도록)
+
+
+class CorrectionCache:
+    def __init__(self, dictionary_version, cache_path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_memory_entries=DEFAULT_MAX_MEMORY_ENTRIES):
+        self.version = f"v{CACHE_VERSION}:{dictionary_version}"
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self._memory = LRUCache(max_memory_entries)  # (임계값, 단어) → (교정 단어 또는 None, 유사도)
+        self._connection = None
+        self._pid = None
+        self._row_count = None  # 캐시 파일의 행 수 추정치 (마지막으로 센 값 + 이후 이 프로세스가 저장한 행 수)
+        self.disabled = False  # SQLite 사용 중 오류가 나면 True (이후로는 메모리 캐시만 사용)
+        self.hits = 0    # 조회 통계 (메모리 또는 SQLite에서 찾은 단어 수)
+        self.misses = 0  # 캐시에 없어서 새로 계산해야 하는 단어 수
+
+    def _connect(self):
+        """프로세스마다 별도 연결 사용 (fork로 물려받은 연결은 공유하면 안 됨)"""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.cache_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")  # 여러 프로세스가 동시에 읽고 쓰기
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS corrections (
+                    version TEXT NOT NULL,
+                    threshold REAL NOT NULL,
+                    word TEXT NOT NULL,
+                    correction TEXT,
+                    similarity REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (version, threshold, word)
+                )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS corrections_last_used ON corrections (last_used)")
+            self._connection = connection
+            self._pid = os.getpid()
+            self._row_count = None
+        return self._connection
+
+    def _disable(self, action, error):
+        """SQLite 오류 후 캐시 파일 사용 중단 (같은 오류를 단어마다 반복하지 않도록)"""
+        print(f"교정 캐시 {action} 오류: {error} (이후 캐시 파일 사용 안 함)")
+        self.disabled = True
+        if self._connection is not None and self._pid == os.getpid():
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+        self._connection = None
+
+    def get_many(self, words, threshold):
+        """캐시에 있는 단어의 {단어: (교정 단어 또는 None, 유사도)} 반환"""
+        found = {}
+        missing = []
+        for word in words:
+            entry = self._memory.get((threshold, word))
+            if entry is None:
+                missing.append(word)
+            else:
+                found[word] = entry
+        if not missing or self.disabled:
+            self.hits += len(found)
+            self.misses += len(missing)
+            return found
+
+        try:
+            connection = self._connect()
+            loaded = []
+            for start in range(0, len(missing), SQLITE_MAX_VARIABLES):
+                chunk = missing[start:start + SQLITE_MAX_VARIABLES]
+                rows = connection.execute(
+                    f"SELECT word, correction, similarity FROM corrections "
+                    f"WHERE version = ? AND threshold = ? AND word IN ({','.join('?' * len(chunk))})",
+                    [self.version, threshold, *chunk]).fetchall()
+                loaded.extend(rows)
+
+            if loaded:
+                # 이 프로세스에서 처음 읽은 항목만 사용 시각 갱신 (이후 조회는 메모리에서 처리)
+                now = time.time()
+                with connection:
+                    connection.executemany(
+                        "UPDATE corrections SET last_used = ? WHERE version = ? AND threshold = ? AND word = ?",
+                        [(now, self.version, threshold, word) for word, _, _ in loaded])
+        except (sqlite3.Error, OSError) as e:  # 캐시 폴더를 만들 수 없는 경우 포함
+            self._disable("읽기", e)
+            loaded = []
+
+        for word, correction, similarity in loaded:
+            found[word] = self._memory.put((threshold, word), (correction, similarity))
+        self.hits += len(found)
+        self.misses += len(words) - len(found)
+        return found
+
+    def put_many(self, entries, threshold):
+        """{단어: (교정 단어 또는 None, 유사도)} 저장 후 항목 수가 상한을 넘으면 정리"""
+        if not entries:
+            return
+        for word, entry in entries.items():
+            self._memory.put((threshold, word), entry)
+        if self.disabled:
+            return
+
+        now = time.time()
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO corrections VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.version, threshold, word, correction, similarity, now)
+                     for word, (correction, similarity) in entries.items()])
+            self._evict(connection, len(entries))
+        except (sqlite3.Error, OSError) as e:
+            self._disable("저장", e)
+
+    def _evict(self, connection, written):
+        """
+        행 수 추정치가 상한을 넘으면 실제 행 수를 세고, 상한을 넘었으면 오래된 항목부터 삭제
+        - 추정치는 덮어쓴 행도 새 행으로 셈 (다른 프로세스가 저장한 행은 그 프로세스의 추정치로 정리)
+        - 상한의 EVICT_TARGET_RATIO까지 줄여서 다음 정리까지 여유를 둠
+        """
+        if self._row_count is not None:
+            self._row_count += written
+            if self._row_count <= self.max_entries:
+                return
+        (count,) = connection.execute("SELECT COUNT(*) FROM corrections").fetchone()
+        if count > self.max_entries:
+            target = int(self.max_entries * EVICT_TARGET_RATIO)
+            with connection:
+                connection.execute(
+                    "DELETE FROM corrections WHERE rowid IN "
+                    "(SELECT rowid FROM corrections ORDER BY last_used LIMIT ?)",
+                    (count - target,))
+            count = target
+        self._row_count = count
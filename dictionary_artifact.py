@@ -0,0 +1,293 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import numpy as np
+from fuzzy_index import JamoWordIndex
+
+"""
+컴파일된 사전 아티팩트 모듈
+- dictionary.txt / dictionary_store_item.json을 단어, 자모 분해 결과, 검색 인덱스를 담은 이진 파일로 변환
+- TextPostProcessor는 이 파일을 mmap으로 열어서 파싱/자모 분해/인덱스 생성 없이 바로 사용
+- 여러 워커 프로세스가 같은 페이지를 공유 (운영체제 페이지 캐시)
+- 가게 사전은 가게명/메뉴명/자모를 모두 문자열 배열로 저장하고, 가게 정보 dict는 조회할 때만 생성
+- 원본 사전이 바뀌면 다음 로드 때 자동으로 다시 생성
+"""
+
+DEFAULT_ARTIFACT_DIR = os.path.join("output", "dictionary_cache")
+ARTIFACT_VERSION = 2  # 저장 형식이나 자모 분해/인덱스 규칙이 바뀌면 올려서 기존 아티팩트 무효화
+MAGIC = b"RCPTDICT"
+ALIGNMENT = 64  # 배열 시작 위치 정렬 (바이트)
+
+
+class MappedStrings:
+    """
+    mmap된 UTF-8 바이트 + 오프셋 배열 위의 읽기 전용 문자열 목록
+    리스트처럼 인덱스/슬라이스/순회가 가능하고, 접근할 때만 문자열로 디코딩
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob        # memoryview (전체 문자열을 이어 붙인 UTF-8 바이트)
+        self.offsets = offsets  # int64 배열 (길이 = 문자열 수 + 1)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return MappedStrings(self.blob, self.offsets[start:max(start, stop) + 1])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("MappedStrings index out of range")
+        return str(self.blob[int(self.offsets[i]):int(self.offsets[i + 1])], 'utf-8')
+
+    def __iter__(self):
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield str(self.blob[start:end], 'utf-8')
+
+
+class MappedStores:
+    """
+    아티팩트의 가게 사전 (가게명 → 가게 정보 dict, JSON 사전의 "stores"와 같은 형식)
+    가게 정보 dict는 조회할 때만 만들고, 메뉴 목록/자모는 mmap된 문자열 배열의 가게별 범위로 반환
+    """
+
+    def __init__(self, names, infos, item_words, item_jamo, ranges):
+        self.names = names            # MappedStrings (목록 순서 = 가게 번호)
+        self.infos = infos            # MappedStrings (가게별 메뉴 외 정보 JSON)
+        self.item_words = item_words  # MappedStrings (모든 가게의 메뉴명을 이어 붙인 목록)
+        self.item_jamo = item_jamo
+        self.ranges = ranges          # int64 배열 (가게 i의 메뉴 = ranges[i]:ranges[i + 1])
+        self._positions = None        # 가게명 → 가게 번호 (처음 조회할 때 생성)
+
+    def _position(self, store_name):
+        if self._positions is None:
+            self._positions = {name: i for i, name in enumerate(self.names)}
+        return self._positions.get(store_name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, store_name):
+        return self._position(store_name) is not None
+
+    def __getitem__(self, store_name):
+        i = self._position(store_name)
+        if i is None:
+            raise KeyError(store_name)
+        info = json.loads(self.infos[i])
+        info["items"] = list(self.store_items(store_name)[0])
+        return info
+
+    def get(self, store_name, default=None):
+        return self[store_name] if store_name in self else default
+
+    def store_info(self, store_name):
+        """가게 정보 dict (메뉴 포함) 또는 None"""
+        return self.get(store_name)
+
+    def store_items(self, store_name):
+        """가게의 (메뉴 목록, 메뉴 자모 목록) 반환, 없는 가게면 None (둘 다 읽기 전용 문자열 목록)"""
+        i = self._position(store_name)
+        if i is None:
+            return None
+        start, end = int(self.ranges[i]), int(self.ranges[i + 1])
+        return self.item_words[start:end], self.item_jamo[start:end]
+
+
+def artifact_path(source_path, artifact_dir=DEFAULT_ARTIFACT_DIR):
+    """원본 사전 경로에 대응하는 아티팩트 경로 (같은 파일명의 다른 사전과 겹치지 않도록 경로 해시 포함)"""
+    source_path = os.path.abspath(source_path)
+    path_hash = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(artifact_dir, f"{os.path.basename(source_path)}.{path_hash}.dict")
+
+
+def _source_info(source_path):
+    stat = os.stat(source_path)
+    with open(source_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+
+def _encode_strings(strings):
+    """문자열 목록 → (UTF-8 바이트 배열, 오프셋 배열)"""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _add_word_list(arrays, header, name, words, words_jamo):
+    """단어 목록 + 자모 + 검색 인덱스를 name 접두사로 저장 목록에 추가"""
+    arrays[f"{name}.words"], arrays[f"{name}.words_offsets"] = _encode_strings(words)
+    arrays[f"{name}.jamo"], arrays[f"{name}.jamo_offsets"] = _encode_strings(words_jamo)
+    index = JamoWordIndex(words, words_jamo)
+    arrays[f"{name}.order"] = index.order.astype(np.int64)
+    arrays[f"{name}.counts"] = index.counts
+    arrays[f"{name}.jamo_lengths"] = index.jamo_lengths
+    header["indexes"][name] = {
+        "alphabet": sorted(index.alphabet_index, key=index.alphabet_index.get),
+        "length_slices": [[length, start, end] for length, (start, end) in index.length_slices.items()],
+    }
+
+
+def build_artifact(source_path, decompose, output_path=None):
+    """
+    원본 사전을 컴파일해서 아티팩트 파일 생성 후 경로 반환
+    decompose: 단어 → 자모 문자열 함수 (TextPostProcessor._decompose)
+    """
+    output_path = output_path or artifact_path(source_path)
+    header = {"version": ARTIFACT_VERSION, "source": _source_info(source_path), "indexes": {}}
+    arrays = {}
+
+    if source_path.endswith('.json'):
+        with open(source_path, 'r', encoding='utf-8') as f:
+            stores_dict = json.load(f).get("stores", {})
+        store_names = list(stores_dict)
+        _add_word_list(arrays, header, "stores", store_names, [decompose(name) for name in store_names])
+
+        # 모든 가게의 메뉴를 한 목록으로 이어 붙이고 가게별 범위만 기록
+        store_items = [stores_dict[name].get("items", []) for name in store_names]
+        items = [item for items_list in store_items for item in items_list]
+        arrays["items.words"], arrays["items.words_offsets"] = _encode_strings(items)
+        arrays["items.jamo"], arrays["items.jamo_offsets"] = _encode_strings([decompose(item) for item in items])
+        item_ranges = np.zeros(len(store_names) + 1, dtype=np.int64)
+        item_ranges[1:] = np.cumsum([len(items_list) for items_list in store_items])
+        arrays["items.ranges"] = item_ranges
+        # 메뉴 외 가게 정보는 가게별 JSON 문자열로 저장 (헤더에 넣으면 로드할 때마다 전체를 파싱)
+        arrays["stores.info"], arrays["stores.info_offsets"] = _encode_strings(
+            [json.dumps({key: value for key, value in stores_dict[name].items() if key != "items"},
+                        ensure_ascii=False) for name in store_names])
+    else:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            words = [line.strip() for line in f if line.strip()]
+        _add_word_list(arrays, header, "dictionary", words, [decompose(word) for word in words])
+
+    # 배열 위치를 정하고 헤더에 기록 (헤더 길이가 위치에 영향을 주므로 크기가 고정될 때까지 반복)
+    data_start = 0
+    while True:
+        offset = data_start
+        header["arrays"] = {}
+        for name, array in arrays.items():
+            header["arrays"][name] = [array.dtype.str, list(array.shape), offset]
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        needed = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+        if needed == data_start:
+            break
+        data_start = needed
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(header["arrays"][name][2])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(offset)
+    os.replace(tmp_path, output_path)  # 다른 프로세스가 읽는 중이어도 깨지지 않도록 원자적 교체
+    return output_path
+
+
+class DictionaryArtifact:
+    """mmap으로 연 사전 아티팩트 (모든 배열/문자열은 읽기 전용 뷰)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"사전 아티팩트 형식 아님: {path}")
+        (header_length,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_length].decode("utf-8"))
+        self._view = memoryview(self._mmap)
+
+    @property
+    def source(self):
+        return self.header["source"]
+
+    def array(self, name):
+        dtype, shape, offset = self.header["arrays"][name]
+        count = int(np.prod(shape)) if shape else 1
+        if count == 0:
+            return np.zeros(shape, dtype=np.dtype(dtype))
+        return np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=count, offset=offset).reshape(shape)
+
+    def strings(self, name):
+        dtype, shape, offset = self.header["arrays"][name]
+        blob = self._view[offset:offset + int(np.prod(shape))]
+        return MappedStrings(blob, self.array(f"{name}_offsets"))
+
+    def word_list(self, name):
+        """name 접두사로 저장된 (단어, 자모, 검색 인덱스) 반환"""
+        meta = self.header["indexes"][name]
+        index = JamoWordIndex.from_arrays(
+            meta["alphabet"], self.array(f"{name}.order"), self.array(f"{name}.counts"),
+            self.array(f"{name}.jamo_lengths"),
+            {length: (start, end) for length, start, end in meta["length_slices"]})
+        words = self.strings(f"{name}.words")
+        return words, self.strings(f"{name}.jamo"), index
+
+    def stores(self):
+        """(가게 사전 MappedStores, 가게명 목록, 가게명 자모, 가게명 인덱스) 반환 (모두 mmap 위의 뷰)"""
+        store_names, store_names_jamo, store_index = self.word_list("stores")
+        stores = MappedStores(store_names, self.strings("stores.info"), self.strings("items.words"),
+                              self.strings("items.jamo"), self.array("items.ranges"))
+        return stores, store_names, store_names_jamo, store_index
+
+
+def _is_current(artifact, source_path):
+    """아티팩트가 현재 원본 사전으로 만든 것인지 확인 (크기/수정 시각이 같으면 해시 계산 생략)"""
+    if artifact.header.get("version") != ARTIFACT_VERSION:
+        return False
+    stat = os.stat(source_path)
+    source = artifact.source
+    if stat.st_size == source["size"] and stat.st_mtime_ns == source["mtime_ns"]:
+        return True
+    return _source_info(source_path)["sha256"] == source["sha256"]
+
+
+def load_artifact(source_path, decompose, artifact_dir=DEFAULT_ARTIFACT_DIR):
+    """원본 사전의 아티팩트를 열어서 반환 (없거나 원본이 바뀌었으면 다시 생성)"""
+    path = artifact_path(source_path, artifact_dir)
+    if os.path.exists(path):
+        try:
+            artifact = DictionaryArtifact(path)
+            if _is_current(artifact, source_path):
+                return artifact
+            print(f"사전 변경 감지, 아티팩트 재생성: {source_path}")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"사전 아티팩트 읽기 오류, 재생성: {e}")
+    build_artifact(source_path, decompose, path)
+    return DictionaryArtifact(path)
+
+
+# 빌드 실행 (배포/야간 작업 전에 미리 컴파일해 두면 첫 로드도 바로 끝남)
+if __name__ == "__main__":
+    import argparse
+    from process_text import TextPostProcessor
+
+    parser = argparse.ArgumentParser(description="사전 아티팩트 컴파일")
+    parser.add_argument("sources", nargs="*", default=["dictionary.txt", "dictionary_store_item.json"],
+                        help="원본 사전 파일 (txt 또는 json)")
+    parser.add_argument("--force", action="store_true", help="원본이 그대로여도 다시 컴파일")
+    args = parser.parse_args()
+
+    for source in args.sources:
+        path = artifact_path(source)
+        if args.force and os.path.exists(path):
+            os.remove(path)
+        TextPostProcessor(dict_path=source)  # 아티팩트가 없거나 원본이 바뀌었으면 여기서 컴파일
+        print(f"아티팩트: {source} → {path} ({os.path.getsize(path):,} bytes)")
@@ -2,6 +2,7 @@ import os
 import re
 import json
 import math
+from receipt_tokens import PRICE, load_token_lines
 
 """
 영수증 텍스트 처리 후 메뉴 항목 추출 모듈
@@ -9,47 +10,35 @@ import math
 - 추출된 정보를 JSON 형태로 구조화하여 저장
 """
 
-def normalize_number(text):
-    if not text:
-        return text
-    
-    text = re.sub(r'O', '0', text)  # O를 0으로 변환 (OCR 오류 보정)
-    text = re.sub(r'[,.\s]', '', text)  # 콤마, 점, 공백 제거
-    
-    return text
-
-def is_price_format(text):
-    return bool(re.match(r'^[\d,]+$', text))  # 숫자와 콤마만 포함하는지 확인
-
 def is_text_format(text):
     # 한글/영문이 포함되고 숫자는 없는지 확인
     return bool(re.search(r'[가-힣a-zA-Z]', text)) and not bool(re.search(r'\d', text))
 
 def extract_menu_items(txt_path):
+    # 텍스트 파일 읽기 (txt 또는 OCR 레코드(.jsonl)), 줄마다 한 번만 토큰화
+    return extract_menu_items_from_lines(load_token_lines(txt_path))
+
+def extract_menu_items_from_lines(token_lines):
+    """토큰화된 줄(receipt_tokens.TokenLine 목록)에서 가게명과 메뉴 항목 추출"""
     menu_items = []
     store_name = None
     started_processing_menu = False  # 메뉴 처리 시작 여부 플래그
     
-    # 텍스트 파일 읽기
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # 첫 줄은 가게명으로 처리
-    if lines and lines[0].strip():
-        store_name = lines[0].strip()
+    # 첫 줄은 가게명으로 처리 (첫 줄이 비어 있으면 가게명 없음)
+    if token_lines and token_lines[0].index == 0:
+        store_name = token_lines[0].text
     
-    # 두 번째 줄부터 메뉴 항목 추출
-    for line in lines[1:]:
-        line = line.strip()
-        if not line:  # 빈 줄 건너뛰기
+    # 두 번째 줄부터 메뉴 항목 추출 (빈 줄은 토큰화 단계에서 제외됨)
+    for line in token_lines:
+        if line.index == 0:
             continue
         
-        words = line.split()
+        tokens = line.tokens
         
         # 메뉴 패턴: 메뉴명 + 단가 + 금액
-        is_menu_pattern = (len(words) >= 3 and 
-                          is_price_format(words[-1]) and  # 마지막 단어: 금액
-                          is_price_format(words[-2]))     # 끝에서 두 번째: 단가
+        is_menu_pattern = (len(tokens) >= 3 and 
+                          tokens[-1].kind == PRICE and  # 마지막 단어: 금액
+                          tokens[-2].kind == PRICE)     # 끝에서 두 번째: 단가
         
         if is_menu_pattern:
             # 메뉴 처리 시작
@@ -57,15 +46,12 @@ def extract_menu_items(txt_path):
                 started_processing_menu = True
             
             # 메뉴명 추출 (마지막 두 단어 제외한 모든 텍스트)
-            menu_name = ' '.join(words[:-2])
-            price = words[-2]  # 단가
-            amount = words[-1]  # 금액
+            menu_name = ' '.join(token.text for token in tokens[:-2])
+            price_int = tokens[-2].value  # 단가 (콤마 제거 후 숫자)
+            amount_int = tokens[-1].value  # 금액
             
-            try:
-                # 숫자로 변환 (콤마 제거)
-                price_int = int(normalize_number(price))
-                amount_int = int(normalize_number(amount))
-                
+            # 숫자가 없는 단어(",")면 무시
+            if price_int is not None and amount_int is not None:
                 # 금액이 단가보다 작으면 조정 (OCR 오류로 가정)
                 if amount_int < price_int:
                     amount_int = price_int
@@ -88,8 +74,6 @@ def extract_menu_items(txt_path):
                     "amount": str(amount_int),
                     "quantity": str(int(quantity))
                 })
-            except ValueError:
-                pass  # 숫자 변환 실패 시 무시
         
         # 메뉴 패턴 끊김 감지 (영수증 하단 정보 등)
         elif started_processing_menu:
@@ -107,7 +91,7 @@ def process_txt_files(input_dir, output_dir):
     
     # 모든 텍스트 파일 처리
     for filename in os.listdir(input_dir):
-        if not filename.endswith('.txt'):  # txt 파일만 처리
+        if not filename.endswith(('.txt', '.jsonl')):  # txt 또는 OCR 레코드 파일만 처리
             continue
             
         total_count += 1
@@ -1,50 +1,26 @@
-import re
 import math
 import os
 import json
-from process_text import TextPostProcessor
+from process_text import get_processor
+from receipt_tokens import load_token_lines
 
-def normalize_number(text):
-    if not text:
-        return text
-    text = re.sub(r'O', '0', text)  # O를 0으로 변환 (OCR 오류 보정)
-    text = re.sub(r'[,.\s]', '', text)  # 콤마, 점, 공백 제거
-    return text
+DICT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dictionary_store_item.json')
 
-def is_number_format(text):
-    """텍스트가 숫자 형식인지 확인"""
-    try:
-        int(normalize_number(text))
-        return True
-    except ValueError:
-        return False
-
-def extract_numbers_from_line(words):
-    """줄에서 숫자 형식의 단어들을 추출"""
-    numbers = []
-    for word in words:
-        if is_number_format(word):
-            try:
-                numbers.append(int(normalize_number(word)))
-            except ValueError:
-                continue
-    return numbers
-
-def extract_menu_items(txt_path):
+def extract_menu_items(txt_path, dict_path=DICT_PATH):
     """
     사전 기반 유사도 매칭을 사용한 메뉴 항목 추출
-    TextPostProcessor를 사용해서 dictionary_store_item.json 로드
+    TextPostProcessor를 사용해서 dictionary_store_item.json 또는 가게/메뉴 카탈로그(.sqlite3) 로드
     """
-    # JSON 사전 파일을 사용하는 TextPostProcessor 생성
-    dict_path = os.path.join(os.path.dirname(__file__), 'dictionary_store_item.json')
-    processor = TextPostProcessor(dict_path=dict_path)
-    
-    # 텍스트 파일 읽기
-    with open(txt_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # 줄별로 정리
-    lines = [line.strip() for line in lines if line.strip()]
+    # 텍스트 파일 읽기 (txt 또는 OCR 레코드(.jsonl)), 줄마다 한 번만 토큰화 (빈 줄 제외)
+    return extract_menu_items_from_lines(load_token_lines(txt_path), dict_path)
+
+def extract_menu_items_from_lines(token_lines, dict_path=DICT_PATH, **processor_options):
+    """
+    토큰화된 줄(receipt_tokens.TokenLine 목록)에서 가게명과 메뉴 항목 추출
+    processor_options: TextPostProcessor 생성 인자 (예: use_artifact=False면 사전 아티팩트 파일을 만들지 않음)
+    """
+    # JSON 사전/카탈로그를 사용하는 TextPostProcessor (레지스트리에서 공유, 사전이 바뀌었을 때만 다시 로드)
+    processor = get_processor(dict_path, **processor_options)
     
     menu_items = []
     store_name = None
@@ -52,19 +28,19 @@ def extract_menu_items(txt_path):
     last_successful_line = -1  # 마지막으로 성공적으로 메뉴가 추가된 줄 번호
     
     # 1) 맨 위부터 읽으면서 가게명 찾기
-    for i, line in enumerate(lines):
+    for i, line in enumerate(token_lines):
         if not store_found:
             # 2) 가게명과 유사도 검사
             # 전체 줄에서 가게명 매칭 시도
-            match, score = processor.find_best_store_match(line)
+            match, score = processor.find_best_store_match(line.text)
             if match:
                 store_name = match
                 store_found = True
-                print(f"🏪 가게명 발견: {line} → {match} (유사도: {score:.2f})")
+                print(f"🏪 가게명 발견: {line.text} → {match} (유사도: {score:.2f})")
                 break
             
             # 단어별로도 시도
-            words = line.split()
+            words = line.words
             for word in words:
                 match, score = processor.find_best_store_match(word)
                 if match:
@@ -78,11 +54,10 @@ def extract_menu_items(txt_path):
     
     # 3) 가게명을 찾았다면, 이후 다시 txt를 읽어서 메뉴 항목 찾기
     if store_found and store_name:
-        for i, line in enumerate(lines):
-            words = line.split()
-            if len(words) == 0:
-                continue
-            print(f"📄 [{i}] 현재 줄: '{line}'")
+        for i, line in enumerate(token_lines):
+            tokens = line.tokens
+            words = line.words
+            print(f"📄 [{i}] 현재 줄: '{line.text}'")
             
             # 연속성 체크: 첫 번째 메뉴가 아니고 이전 성공 줄과 너무 멀면 중단
             if last_successful_line != -1 and i > last_successful_line + 2:
@@ -94,34 +69,23 @@ def extract_menu_items(txt_path):
             best_end_index = -1
             best_test_phrase = None  # 실제 매칭된 구문 저장
             
-            # 첫 번째 단어부터만 시작
-            for k in range(0, len(words)):
-                # 0부터 k까지의 단어들을 합침
-                if k == 0:
-                    # 첫 번째 단어만
-                    test_phrase = words[0]
-                else:
-                    # 여러 단어를 띄어쓰기로 연결
-                    test_phrase = " ".join(words[0:k+1])
-                
-                # 메뉴 사전과 비교
-                match, score = processor.find_best_item_match(test_phrase, store_name)
-                
+            # 첫 번째 단어부터만 시작, 0부터 k까지의 단어들을 띄어쓰기로 연결한 구문을 메뉴 사전과 비교
+            # (앞 구문의 비교 상태를 이어서 쓰므로 단어가 하나 늘 때마다 새 단어만 추가로 계산)
+            for k, (match, score) in enumerate(processor.iter_item_prefix_matches(words, store_name)):
                 if match and score > best_score:
                     best_match = match
                     best_score = score
                     best_end_index = k
-                    best_test_phrase = test_phrase  # 실제 매칭된 구문 저장
+                    best_test_phrase = " ".join(words[0:k+1])  # 실제 매칭된 구문 저장
                 
                 # 숫자가 나타나면 더 이상 확장하지 않음
-                if k < len(words) - 1 and is_number_format(words[k+1]):
+                if k < len(tokens) - 1 and tokens[k+1].value is not None:
                     break
             
             # 최고 매칭이 있다면 처리
             if best_match and best_score >= 0.4:  # 임계값
                 # 매칭된 부분 다음부터 숫자 추출
-                remaining_words = words[best_end_index + 1:]
-                numbers = extract_numbers_from_line(remaining_words)
+                numbers = line.numbers(best_end_index + 1)
                 
                 menu_added = False
                 
@@ -179,7 +143,7 @@ def extract_menu_items(txt_path):
     
     return store_name, menu_items
 
-def process_txt_files(input_dir, output_dir):
+def process_txt_files(input_dir, output_dir, dict_path=DICT_PATH):
     # 출력 폴더 생성
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -189,7 +153,7 @@ def process_txt_files(input_dir, output_dir):
     
     # 모든 텍스트 파일 처리
     for filename in os.listdir(input_dir):
-        if not filename.endswith('.txt'):  # txt 파일만 처리
+        if not filename.endswith(('.txt', '.jsonl')):  # txt 또는 OCR 레코드 파일만 처리
             continue
             
         total_count += 1
@@ -205,7 +169,7 @@ def process_txt_files(input_dir, output_dir):
         print(f"\n처리 중: {filename}")
         
         # 메뉴 정보 추출
-        store_name, menu_items = extract_menu_items(txt_path)
+        store_name, menu_items = extract_menu_items(txt_path, dict_path)
         
         # 메뉴 항목이 있는 경우만 JSON 생성
         if menu_items:
@@ -241,11 +205,17 @@ def process_txt_files(input_dir, output_dir):
     print(f"\n처리 완료: {processed_count}/{total_count} 파일 처리됨")
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="사전 기반 메뉴/가격 추출")
+    parser.add_argument("--dict", default=DICT_PATH,
+                        help="가게/메뉴 사전 (JSON 또는 store_catalog.py로 만든 .sqlite3 카탈로그)")
+    args = parser.parse_args()
+    
     # 경로 설정
     output_dir = "output"
     input_dir = os.path.join(output_dir, "ocr_processed_txt")  # 처리된 OCR 텍스트 폴더
     json_output_dir = os.path.join(output_dir, "json")  # JSON 출력 폴더
     
     print(f"'{input_dir}' 폴더의 텍스트 파일에서 메뉴 항목 추출 시작...")
-    process_txt_files(input_dir, json_output_dir)
+    process_txt_files(input_dir, json_output_dir, args.dict)
     print(f"\n처리 완료. 결과는 '{json_output_dir}' 폴더에 저장됨")
\ No newline at end of file
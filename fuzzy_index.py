@@ -0,0 +1,374 @@
+import numpy as np
+from rapidfuzz.distance import Indel, Jaro
+from rapidfuzz.process import cdist
+
+"""
+사전 단어 퍼지 검색 인덱스
+- 사전 단어를 글자 수별로 나누고, 단어마다 자모 개수 벡터(서명)를 미리 계산
+- 질의 단어와 공유하는 자모 수로 유사도 상한을 구해 임계값에 못 미치는 단어 제외
+- TextPostProcessor의 사전 단어/가게명/메뉴명 매칭에서 전체 순회를 대체 (최종 결과는 동일)
+- 여러 단어를 한 번에 교정할 때는 단어 × 사전 유사도 행렬을 rapidfuzz로 일괄 계산
+- 큰 가게명 목록은 자모 3-gram 역색인으로 공유 n-gram이 많은 후보만 추려서 비교
+- 단어를 하나씩 이어 붙이는 메뉴 구문은 비트 병렬 LCS 상태를 이어서 갱신 (구문마다 처음부터 비교하지 않음)
+"""
+
+SIMILARITY_EPSILON = 1e-9  # 부동소수점 오차로 후보를 놓치지 않도록 상한에 주는 여유
+BATCH_MATRIX_CELLS = 4_000_000  # 유사도 행렬을 한 번에 계산할 최대 칸 수 (float64 기준 약 32MB)
+NGRAM_SIZE = 3
+NGRAM_PADDING = ("\x02", "\x03")  # 단어 앞뒤 표시 (짧은 단어도 n-gram이 생기도록)
+BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+class JamoWordIndex:
+    """
+    유사도 매칭 후보 검색 인덱스 (글자 수별 버킷 + 자모 서명)
+
+    두 단어가 공유하는 자모 수(중복 포함) C는 LCS 길이와 jaro 일치 문자 수의 상한이므로
+    - ratio (3글자 이상끼리): ratio = 2·LCS / (L1 + L2) ≤ 2C / (L1 + L2)
+    - jaro (한쪽이 2글자 이하): jaro ≤ (C/L1 + C/L2 + 1) / 3
+    여기에 calculate_jamo_similarity의 길이 보정(사전 단어가 짧으면 글자당 -0.1)을 더한 값이
+    임계값 미만인 단어는 최종 후보가 될 수 없음
+    """
+
+    def __init__(self, words, words_jamo):
+        self.size = len(words)
+        alphabet = sorted(set(''.join(words_jamo)))
+        self.alphabet_index = {char: i for i, char in enumerate(alphabet)}
+
+        # 글자 수 순으로 정렬해서 같은 글자 수 단어가 연속된 행이 되도록 배치
+        syllable_lengths = np.array([len(word) for word in words], dtype=np.int64)
+        self.order = np.argsort(syllable_lengths, kind='stable')  # 행 → 사전 인덱스
+
+        self.counts = np.zeros((len(words), max(len(alphabet), 1)), dtype=np.uint8)  # 자모 개수 서명
+        self.jamo_lengths = np.zeros(len(words), dtype=np.float64)
+        for row, index in enumerate(self.order):
+            jamo = words_jamo[index]
+            self.jamo_lengths[row] = len(jamo)
+            for char in jamo:
+                column = self.alphabet_index[char]
+                if self.counts[row, column] < 255:
+                    self.counts[row, column] += 1
+
+        # 글자 수 → 행 범위 [start, end)
+        self.length_slices = {}
+        sorted_lengths = syllable_lengths[self.order]
+        for length in np.unique(sorted_lengths):
+            start, end = np.searchsorted(sorted_lengths, [length, length + 1])
+            self.length_slices[int(length)] = (int(start), int(end))
+
+    @classmethod
+    def from_arrays(cls, alphabet, order, counts, jamo_lengths, length_slices):
+        """미리 계산된 배열로 인덱스 생성 (사전 아티팩트의 mmap 배열을 복사 없이 사용)"""
+        index = cls.__new__(cls)
+        index.size = len(order)
+        index.alphabet_index = {char: i for i, char in enumerate(alphabet)}
+        index.order = order
+        index.counts = counts
+        index.jamo_lengths = jamo_lengths
+        index.length_slices = length_slices
+        return index
+
+    def word_lengths(self):
+        """사전 순서대로 단어 글자 수 배열 (글자 수별 행 범위에서 계산하므로 단어 문자열을 읽지 않음)"""
+        lengths = np.zeros(self.size, dtype=np.int64)
+        for length, (start, end) in self.length_slices.items():
+            lengths[self.order[start:end]] = length
+        return lengths
+
+    def _signature(self, jamo):
+        vector = np.zeros(self.counts.shape[1], dtype=np.uint8)
+        for char in jamo:
+            column = self.alphabet_index.get(char)
+            if column is not None and vector[column] < 255:
+                vector[column] += 1
+        return vector
+
+    def ranked_candidates(self, word, word_jamo, threshold):
+        """
+        유사도가 threshold 이상이 될 수 있는 사전 인덱스를 (유사도 상한, 인덱스) 목록으로 반환
+        상한이 높은 순(같으면 사전 순)으로 정렬되어 있어서, 호출 쪽은 상한이 현재 최고
+        유사도보다 낮아지는 순간 탐색을 멈출 수 있음
+        """
+        word_length = len(word)
+        query_jamo_length = len(word_jamo)
+        signature = self._signature(word_jamo)
+
+        selected_rows = []
+        selected_upper = []
+        for length, (start, end) in self.length_slices.items():
+            if abs(word_length - length) > word_length / 2:  # 매칭 함수들의 길이 차이 조건
+                continue
+
+            shared = np.minimum(self.counts[start:end], signature).sum(axis=1, dtype=np.float64)
+            jamo_lengths = self.jamo_lengths[start:end]
+            penalty = 0.1 * min(0, length - word_length)
+
+            if word_length <= 2 or length <= 2:
+                upper = (shared / max(query_jamo_length, 1) + shared / jamo_lengths + 1) / 3
+                upper[shared == 0] = 0  # 일치 문자가 없으면 jaro = 0
+            else:
+                upper = 2 * shared / (query_jamo_length + jamo_lengths)
+            upper = np.clip(upper + penalty, 0, 1)
+
+            keep = upper >= threshold - SIMILARITY_EPSILON
+            selected_rows.append(np.arange(start, end)[keep])
+            selected_upper.append(upper[keep])
+
+        if not selected_rows:
+            return []
+        indices = self.order[np.concatenate(selected_rows)]
+        upper = np.concatenate(selected_upper)
+        ranking = np.lexsort((indices, -upper))  # 상한 내림차순, 같으면 사전 순
+        return list(zip(upper[ranking].tolist(), indices[ranking].tolist()))
+
+    def candidates(self, word, word_jamo, threshold):
+        """유사도가 threshold 이상이 될 수 있는 사전 인덱스를 사전 순서대로 반환"""
+        return sorted(index for _, index in self.ranked_candidates(word, word_jamo, threshold))
+
+
+class BatchMatcher:
+    """
+    사전 단어 목록 하나에 대한 일괄 매칭 (batch_best_matches의 사전 쪽 준비를 호출마다 반복하지 않음)
+    - 단어 글자 수 배열과 질의 글자 수별 비교 열 묶음(열, 길이 보정, 자모 목록)을 한 번만 만들어 보관
+    - 사전 자모가 mmap 문자열 목록이어도 처음 한 번만 디코딩
+    """
+
+    def __init__(self, words_jamo, word_lengths):
+        self.words_jamo = words_jamo
+        self.word_lengths = np.asarray(word_lengths, dtype=np.int64)
+        self._jamo_list = None  # 디코딩한 사전 자모 (처음 사용할 때 생성)
+        self._groups = {}       # 질의 글자 수 → (열, 열 글자 수, 길이 보정, [(열 마스크, 자모 목록, 유사도 함수)])
+
+    def _group(self, length):
+        group = self._groups.get(length)
+        if group is None:
+            if self._jamo_list is None:
+                self._jamo_list = list(self.words_jamo)
+            columns = np.flatnonzero(np.abs(self.word_lengths - length) <= length / 2)  # 매칭 함수들의 길이 차이 조건
+            column_lengths = self.word_lengths[columns]
+            use_jaro = np.ones(len(columns), dtype=bool) if length <= 2 else column_lengths <= 2
+            penalty = 0.1 * np.minimum(0, column_lengths - length)
+            scorers = [(mask, [self._jamo_list[i] for i in columns[mask].tolist()], scorer)
+                       for mask, scorer in ((use_jaro, Jaro.similarity), (~use_jaro, Indel.normalized_similarity))
+                       if mask.any()]
+            group = self._groups[length] = (columns, column_lengths, penalty, scorers)
+        return group
+
+    def best_matches(self, queries, queries_jamo):
+        """batch_best_matches와 같은 결과"""
+        results = [(-1, 0.0)] * len(queries)
+        if not queries or not len(self.word_lengths):
+            return results
+
+        groups = {}
+        for q, query in enumerate(queries):
+            groups.setdefault(len(query), []).append(q)
+
+        for length, members in groups.items():
+            columns, column_lengths, penalty, scorers = self._group(length)
+            if not columns.size:
+                continue
+            step = max(1, BATCH_MATRIX_CELLS // len(columns))
+            for start in range(0, len(members), step):
+                rows = members[start:start + step]
+                rows_jamo = [queries_jamo[q] for q in rows]
+                similarity = np.empty((len(rows), len(columns)), dtype=np.float64)
+                for mask, choices, scorer in scorers:
+                    similarity[:, mask] = cdist(rows_jamo, choices, scorer=scorer, dtype=np.float64)
+                similarity = np.clip(similarity + penalty, 0, 1)
+
+                # 최고 유사도 → 그중 가장 긴 단어 → 그중 가장 앞선 열 (columns는 사전 순서)
+                best_similarity = similarity.max(axis=1)
+                tied = similarity == best_similarity[:, None]
+                longest = np.where(tied, column_lengths, -1).max(axis=1)
+                tied &= column_lengths == longest[:, None]
+                best_columns = columns[tied.argmax(axis=1)]
+
+                for q, column, score in zip(rows, best_columns.tolist(), best_similarity.tolist()):
+                    results[q] = (column, score)
+        return results
+
+
+def batch_best_matches(queries, queries_jamo, words, words_jamo):
+    """
+    질의 단어마다 가장 유사한 사전 단어의 (인덱스, 유사도) 목록 반환 (후보가 없으면 (-1, 0.0))
+    - 유사도 규칙은 TextPostProcessor._jamo_similarity와 동일 (jaro/ratio 선택, 길이 보정, 0~1 제한)
+    - 같은 글자 수의 질의끼리 묶어서 길이 차이 조건을 통과하는 사전 열만 cdist로 한 번에 계산
+    - 동점이면 더 긴 단어, 그것도 같으면 사전에서 먼저 나온 단어 선택 (_best_match와 동일)
+    같은 사전으로 반복 호출할 때는 BatchMatcher를 한 번 만들어서 재사용
+    """
+    word_lengths = np.array([len(word) for word in words], dtype=np.int64)
+    return BatchMatcher(words_jamo, word_lengths).best_matches(queries, queries_jamo)
+
+
+class PrefixMatcher:
+    """
+    점점 길어지는 질의(단어를 하나씩 이어 붙인 구문)와 단어 목록 전체의 유사도를 이어서 계산
+    - ratio = 1 - (L1 + L2 - 2·LCS) / (L1 + L2)의 LCS를 비트 병렬 DP 행(Hyyrö)으로 갱신
+    - 모든 단어의 DP 행을 바이트 단위로 맞춰 한 정수에 이어 붙이고(단어 뒤에 받아올림을 막는 0 비트),
+      질의 자모 하나마다 정수 연산 몇 번으로 전체 단어의 행을 한 번에 갱신
+    - 새로 붙은 단어의 자모만 처리하므로 앞 구문의 자모 분해/정렬 결과를 다시 계산하지 않음
+    - jaro(한쪽이 2글자 이하)는 누적할 상태가 없으므로 해당 단어만 직접 계산
+    - 유사도 규칙과 동점 처리는 batch_best_matches와 동일
+    """
+
+    def __init__(self, words, words_jamo):
+        self.words_jamo = words_jamo
+        self.word_lengths = np.array([len(word) for word in words], dtype=np.int64)
+        self.jamo_lengths = np.array([len(jamo) for jamo in words_jamo], dtype=np.int64)
+        # 단어마다 자모 길이 + 구분 비트 1개 이상을 바이트 단위로 배치 (단어별 LCS를 바이트 popcount 합으로 계산)
+        segment_bytes = (self.jamo_lengths + 8) // 8
+        self.byte_starts = np.zeros(len(words_jamo), dtype=np.int64)
+        self.byte_starts[1:] = np.cumsum(segment_bytes)[:-1]
+        self.starts = self.byte_starts * 8
+        self.byte_count = max(1, int(segment_bytes.sum()))
+
+        positions = {}
+        for start, jamo in zip(self.starts.tolist(), words_jamo):
+            for offset, char in enumerate(jamo):
+                positions.setdefault(char, []).append(start + offset)
+        self.masks = {char: self._bits_to_int(bits) for char, bits in positions.items()}  # 자모 → 나오는 비트 위치
+        self.valid = self._bits_to_int(  # 단어 자모 위치만 1 (구분 비트는 항상 0)
+            [start + offset for start, length in zip(self.starts.tolist(), self.jamo_lengths.tolist())
+             for offset in range(length)])
+
+    def _bits_to_int(self, positions):
+        bits = np.zeros(self.byte_count * 8, dtype=np.uint8)
+        bits[positions] = 1
+        return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+    def _extend(self, state, jamo):
+        """질의 끝에 jamo를 붙였을 때의 DP 행 (0 비트 수 = LCS 길이)"""
+        valid = self.valid
+        for char in jamo:
+            match = state & self.masks.get(char, 0)
+            state = ((state + match) | (state - match)) & valid
+        return state
+
+    def _lcs_lengths(self, state):
+        ones = BYTE_POPCOUNT[np.frombuffer(state.to_bytes(self.byte_count, 'little'), dtype=np.uint8)]
+        return self.jamo_lengths - np.add.reduceat(ones, self.byte_starts)
+
+    def iter_prefix_matches(self, parts, parts_jamo, separator=" "):
+        """parts[0..k]를 separator로 이어 붙인 구문마다 가장 유사한 단어의 (인덱스, 유사도) 생성 (없으면 (-1, 0.0))"""
+        state = self.valid
+        query, query_jamo = "", ""
+        for part, part_jamo in zip(parts, parts_jamo):
+            if query:
+                part, part_jamo = separator + part, separator + part_jamo
+            query += part
+            query_jamo += part_jamo
+            state = self._extend(state, part_jamo)
+            yield self._best(state, len(query), query_jamo)
+
+    def _best(self, state, length, query_jamo):
+        columns = np.flatnonzero(np.abs(self.word_lengths - length) <= length / 2)  # 매칭 함수들의 길이 차이 조건
+        if not columns.size:
+            return -1, 0.0
+        column_lengths = self.word_lengths[columns]
+
+        # ratio: rapidfuzz Indel.normalized_similarity와 같은 계산 순서 (부동소수점 결과까지 동일)
+        lensum = self.jamo_lengths[columns] + len(query_jamo)
+        distance = lensum - 2 * self._lcs_lengths(state)[columns]
+        similarity = 1.0 - distance / np.maximum(lensum, 1)
+
+        use_jaro = np.ones(len(columns), dtype=bool) if length <= 2 else column_lengths <= 2
+        for c in np.flatnonzero(use_jaro).tolist():
+            similarity[c] = Jaro.similarity(query_jamo, self.words_jamo[int(columns[c])])
+        similarity = np.clip(similarity + 0.1 * np.minimum(0, column_lengths - length), 0, 1)
+
+        # 최고 유사도 → 그중 가장 긴 단어 → 그중 가장 앞선 단어
+        best_similarity = similarity.max()
+        tied = similarity == best_similarity
+        tied &= column_lengths == column_lengths[tied].max()
+        return int(columns[tied.argmax()]), float(best_similarity)
+
+
+def jamo_ngrams(jamo, n=NGRAM_SIZE):
+    """자모 문자열의 n-gram 집합 (앞뒤에 표시 문자를 붙여서 1글자 단어도 n-gram 생성)"""
+    padded = f"{NGRAM_PADDING[0]}{jamo}{NGRAM_PADDING[1]}"
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+class JamoNgramIndex:
+    """
+    자모 n-gram → 단어 인덱스 역색인
+    질의와 공유하는 n-gram 수가 많은 단어만 추려서 후보로 반환 (목록 크기와 무관하게 거의 일정한 비용)
+    q-gram 개수 조건으로 후보 밖의 단어가 임계값에 못 미치는 것이 확실할 때만 후보 비교 결과가 정확함
+    (확실하지 않으면 JamoWordIndex로 전체 비교)
+    """
+
+    def __init__(self, words, words_jamo):
+        self.size = len(words)
+        self.lengths = np.array([len(word) for word in words], dtype=np.int64)
+        self.jamo_lengths = np.array([len(jamo) for jamo in words_jamo], dtype=np.int64)
+        postings = {}
+        for i, jamo in enumerate(words_jamo):
+            for gram in jamo_ngrams(jamo):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+        self._init_length_bounds()
+
+    @classmethod
+    def from_postings(cls, lengths, jamo_lengths, postings):
+        """
+        미리 계산한 단어 글자 수/자모 길이 배열과 n-gram → 인덱스 배열 조회 객체(get 지원, 예: 카탈로그)로 생성
+        """
+        index = cls.__new__(cls)
+        index.size = len(lengths)
+        index.lengths = lengths
+        index.jamo_lengths = jamo_lengths
+        index.postings = postings
+        index._init_length_bounds()
+        return index
+
+    def _init_length_bounds(self):
+        # 글자 수 → 그 글자 수 단어의 최대 자모 길이 (역색인에 없는 단어까지 포함한 q-gram 하한 계산용)
+        self.max_jamo_lengths = {}
+        for length, jamo_length in zip(self.lengths.tolist(), self.jamo_lengths.tolist()):
+            if jamo_length > self.max_jamo_lengths.get(length, -1):
+                self.max_jamo_lengths[length] = jamo_length
+
+    def scored(self, word, word_jamo):
+        """질의와 n-gram을 하나 이상 공유하고 길이 차이 조건을 통과하는 (단어 인덱스 배열, 공유 n-gram 수 배열)"""
+        lists = [ids for ids in map(self.postings.get, jamo_ngrams(word_jamo)) if ids is not None]
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        indices, shared = np.unique(np.concatenate(lists), return_counts=True)
+
+        # 매칭 함수들의 길이 차이 조건
+        keep = np.abs(self.lengths[indices] - len(word)) <= len(word) / 2
+        return indices[keep], shared[keep]
+
+    def shortlist(self, word, word_jamo, size):
+        """공유 n-gram 수 상위 size개 단어 인덱스 (많은 순, 같으면 목록 순), 길이 차이 조건을 넘는 단어는 제외"""
+        return self.top_ranked(*self.scored(word, word_jamo), size)
+
+    @staticmethod
+    def top_ranked(indices, shared, size):
+        """scored 결과에서 공유 n-gram 수 상위 size개 단어 인덱스 (많은 순, 같으면 목록 순)"""
+        return indices[np.lexsort((indices, -shared))[:size]].tolist()
+
+    def filter_candidates(self, word, word_jamo, threshold, indices, shared):
+        """
+        q-gram 개수 조건으로 유사도가 threshold 이상일 수 있는 단어만 반환 (scored 결과에서 선택)
+        - ratio ≥ t이면 Indel 거리 d ≤ (1 - t)(L1 + L2) (L: 자모 길이)
+        - 삽입/삭제 한 번에 질의의 n-gram은 최대 n개 사라지므로 공유 n-gram ≥ |질의 n-gram| - n·d
+        모든 단어에서 이 하한이 1 이상이어야 역색인에 없는 단어를 제외할 수 있으므로, 그렇지 않으면 None
+        (jaro를 쓰는 2글자 이하 단어도 n-gram 하한이 없으므로 None)
+        """
+        length = len(word)
+        window = [n for n in self.max_jamo_lengths if abs(n - length) <= length / 2]  # 길이 차이 조건
+        if not window:
+            return indices[:0]  # 조건을 통과하는 단어가 없음
+        if length <= 2 or min(window) <= 2:
+            return None
+
+        query_grams = len(jamo_ngrams(word_jamo))
+        def min_shared(jamo_lengths):
+            max_distance = np.floor((1 - threshold) * (len(word_jamo) + jamo_lengths) + SIMILARITY_EPSILON)
+            return query_grams - NGRAM_SIZE * max_distance
+
+        if min_shared(max(self.max_jamo_lengths[n] for n in window)) < 1:
+            return None
+        return indices[shared >= min_shared(self.jamo_lengths[indices])]
@@ -0,0 +1,101 @@
+import cv2
+import numpy as np
+
+"""
+OCR 전처리 모듈
+- 긴 변 기준 축소, 흑백 변환, 적응형 이진화, 기울기 보정
+- 각 단계는 옵션으로 켜고 끌 수 있음
+- 전처리 이미지 좌표 → 원본 이미지 좌표 변환 행렬 제공
+"""
+
+# 기본 전처리 옵션
+DEFAULT_OPTIONS = {
+    "max_side": 1600,      # 긴 변 최대 픽셀 (0이면 축소 안 함)
+    "grayscale": True,     # 흑백 변환
+    "binarize": True,      # 적응형 이진화
+    "block_size": 31,      # 이진화 주변 영역 크기 (홀수)
+    "threshold_c": 15,     # 이진화 보정 상수
+    "deskew": True,        # 기울기 보정
+    "max_skew_angle": 10,  # 이 각도보다 크게 추정되면 오검출로 보고 보정 안 함
+}
+
+
+def _estimate_skew_angle(gray):
+    """글자 줄 덩어리들의 기울기 중앙값으로 전체 기울기 각도(도) 추정"""
+    _, inverted = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    # 가로로 팽창시켜 한 줄의 글자들을 하나의 덩어리로 연결
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(gray.shape[1] // 40, 3), 1))
+    contours, _ = cv2.findContours(cv2.dilate(inverted, kernel), cv2.RETR_EXTERNAL,
+                                   cv2.CHAIN_APPROX_SIMPLE)
+
+    angles = []
+    for contour in contours:
+        _, (w, h), angle = cv2.minAreaRect(contour)
+        if w < h:  # 긴 변 방향 기준 각도로 통일
+            w, h = h, w
+            angle += 90
+        angle = (angle + 90) % 180 - 90  # OpenCV 버전마다 다른 각도 범위를 (-90, 90]으로 정규화
+        # 가로로 충분히 긴 덩어리(글자 줄)만 사용
+        if h < 2 or w < 4 * h or w < gray.shape[1] * 0.05 or abs(angle) > 45:
+            continue
+        angles.append(angle)
+
+    return float(np.median(angles)) if angles else 0.0
+
+
+def preprocess(image, options=None):
+    """
+    RGB 이미지 배열 전처리 후 (전처리 이미지, 원본 좌표 변환 행렬) 반환
+    변환 행렬은 3x3 동차 좌표 행렬 (전처리 좌표 → 원본 좌표)
+    """
+    opts = dict(DEFAULT_OPTIONS)
+    if options:
+        opts.update(options)
+
+    forward = np.eye(3)  # 원본 → 전처리 좌표 변환 누적
+
+    # 1) 긴 변 기준 축소 (픽셀 수에 비례하는 OCR 비용 절감)
+    height, width = image.shape[:2]
+    max_side = opts["max_side"]
+    if max_side and max(height, width) > max_side:
+        scale = max_side / max(height, width)
+        image = cv2.resize(image, (round(width * scale), round(height * scale)),
+                           interpolation=cv2.INTER_AREA)
+        forward = np.diag([scale, scale, 1.0]) @ forward
+
+    # 2) 흑백 변환
+    if opts["grayscale"] and image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+    # 3) 기울기 보정
+    if opts["deskew"]:
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        angle = _estimate_skew_angle(gray)
+        if 0.5 <= abs(angle) <= opts["max_skew_angle"]:
+            height, width = image.shape[:2]
+            rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            image = cv2.warpAffine(image, rotation, (width, height), flags=cv2.INTER_LINEAR,
+                                   borderMode=cv2.BORDER_REPLICATE)
+            forward = np.vstack([rotation, [0, 0, 1]]) @ forward
+
+    # 4) 적응형 이진화 (조명 불균일한 사진에 강함)
+    if opts["binarize"]:
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        image = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                      cv2.THRESH_BINARY, opts["block_size"], opts["threshold_c"])
+
+    return image, np.linalg.inv(forward)
+
+
+def map_result_to_original(result, to_original):
+    """readtext 결과의 경계 상자를 원본 이미지 좌표로 변환"""
+    if not result:
+        return result
+    if np.allclose(to_original, np.eye(3)):
+        return result  # 변환이 없으면 그대로 반환
+
+    boxes = np.array([bbox for bbox, _, _ in result], dtype=np.float64)  # (N, 4, 2)
+    mapped = boxes @ to_original[:2, :2].T + to_original[:2, 2]
+    mapped = np.rint(mapped).astype(int).tolist()
+
+    return [(mapped[i], text, conf) for i, (_, text, conf) in enumerate(result)]
@@ -1,13 +1,23 @@
 import os
-import easyocr
+import argparse
+import threading
+import zlib
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from PIL import Image, ImageDraw, ImageFont
-import re
+import io
+import cv2
+import numpy as np
+from ocr_cache import OCRCache
+from ocr_record import build_record, save_record, save_text_view
+from image_preprocess import DEFAULT_OPTIONS as DEFAULT_PREPROCESS_OPTIONS, preprocess, map_result_to_original
 
 """
 영수증 이미지에서 텍스트 추출 모듈
 - EasyOCR을 사용하여 이미지에서 텍스트 인식
 - 인식된 텍스트를 원본 이미지 위치에 시각화
 - 인식된 텍스트를 줄 단위로 그룹화하여 저장
+- 토큰별 경계 상자/신뢰도를 담은 구조화 레코드(JSONL) 저장
 """
 
 # 폴더 경로 설정
@@ -16,18 +26,233 @@ OUTPUT_DIR = "output"       # 출력 상위 폴더
 OCR_VIS_PATH = os.path.join(OUTPUT_DIR, "ocr_vis")           # 시각화 이미지 저장 폴더
 OCR_RAW_TXT_PATH = os.path.join(OUTPUT_DIR, "ocr_raw_txt")   # OCR 원본 텍스트 폴더
 JSON_PATH = os.path.join(OUTPUT_DIR, "json")                 # JSON 파일 저장 폴더
+OCR_CACHE_PATH = os.path.join(OUTPUT_DIR, "ocr_cache")       # OCR 결과 캐시 폴더
+OCR_RECORDS_PATH = os.path.join(OUTPUT_DIR, "ocr_records")   # OCR 구조화 레코드 폴더
+
+# 줄 그룹화 설정 - Y 중심 차이가 글자 높이 중앙값 × 비율 이하면 같은 줄
+LINE_HEIGHT_RATIO = 0.5
 
 # 폰트 설정
 font_size = 20
-font = ImageFont.truetype("GmarketSansTTFLight.ttf", font_size, encoding="UTF-8")
+FONT_PATH = "GmarketSansTTFLight.ttf"
+
+# EasyOCR 설정 (캐시 키에도 사용)
+READER_LANGS = ['en', 'ko']  # 한글/영어 인식
+READER_GPU = False           # CPU 사용
+USE_OCR_CACHE = True         # 같은 이미지의 OCR 결과 재사용 여부
+USE_PREPROCESS = False       # OCR 전 축소/흑백/이진화/기울기 보정 여부 (켜면 인식 결과가 달라짐)
+PREPROCESS_OPTIONS = dict(DEFAULT_PREPROCESS_OPTIONS)  # 전처리 단계별 옵션
+VIS_MODE = "off"             # OCR 시각화 저장: off(안 함, 기본) / sample(일부) / all(전체)
+VIS_SAMPLE_RATE = 0.1        # sample 모드에서 시각화할 이미지 비율
+VIS_WORKERS = 2              # 시각화(그리기 + PNG 저장) 백그라운드 스레드 수
+VIS_MAX_PENDING = 2 * VIS_WORKERS  # 동시에 대기/진행 중인 시각화 최대 수 (작업마다 디코딩된 이미지 보관)
+SKIP_REGIONS = False         # 검출 결과에서 바코드/하단 영역을 걸러내고 나머지만 인식
+REGION_FILTER_OPTIONS = {
+    "barcode_height_ratio": 2.0,  # 글자 높이 중앙값의 이 배수보다 높고
+    "barcode_min_aspect": 2.0,    # 가로/세로 비율이 이 이상이면 바코드로 간주
+    "footer_ratio": None,         # 중심이 이미지 높이의 이 비율 아래인 영역 제외 (None이면 사용 안 함)
+}
+ADAPTIVE_OCR = False         # 축소 이미지로 먼저 인식하고 저신뢰 영역만 재인식
+ADAPTIVE_OPTIONS = {
+    "fast_scale": 0.5,       # 1차 인식 이미지 축소 비율
+    "min_confidence": 0.5,   # 이 신뢰도 미만인 영역만 원본 해상도로 재인식
+    "padding": 2,            # 재인식 영역 여백 (픽셀)
+}
+
+# EasyOCR 모델과 폰트는 처음 사용할 때 로드 (import 시점 비용 제거)
+_reader = None
+_fonts = {}  # 크기별 폰트 캐시
+_font_lock = threading.Lock()
+_ocr_cache = None
+_vis_executor = None
+_vis_slots = None  # 대기 중 시각화 수 제한 (OCR이 시각화보다 빠를 때 메모리 증가 방지)
+
+def get_reader():
+    """EasyOCR Reader 반환 - 최초 호출 시 한 번만 생성"""
+    global _reader
+    if _reader is None:
+        import easyocr  # torch 포함 무거운 모듈이므로 실제 사용 시점에 import
+        print("EasyOCR 모델 로드 중...")
+        _reader = easyocr.Reader(READER_LANGS, gpu=READER_GPU)
+        print("EasyOCR 모델 로드 완료")
+    return _reader
+
+def get_font(size=font_size):
+    """시각화용 폰트 반환 - 크기별로 한 번만 로드해서 재사용"""
+    font = _fonts.get(size)
+    if font is None:
+        with _font_lock:  # 시각화 스레드끼리 같은 크기를 중복 로드하지 않도록
+            font = _fonts.get(size)
+            if font is None:
+                font = ImageFont.truetype(FONT_PATH, size, encoding="UTF-8")
+                _fonts[size] = font
+    return font
+
+def get_ocr_cache():
+    """OCR 결과 캐시 반환 - 캐시 사용이 꺼져 있으면 None"""
+    global _ocr_cache
+    if not USE_OCR_CACHE:
+        return None
+    if _ocr_cache is None:
+        config = {
+            "langs": READER_LANGS,
+            "gpu": READER_GPU,
+            "preprocess": PREPROCESS_OPTIONS if USE_PREPROCESS else None,  # 전처리가 다르면 결과도 다름
+            "adaptive": ADAPTIVE_OPTIONS if ADAPTIVE_OCR else None,
+            "skip_regions": REGION_FILTER_OPTIONS if SKIP_REGIONS else None,
+        }
+        _ocr_cache = OCRCache(OCR_CACHE_PATH, config=config)
+    return _ocr_cache
+
+def filter_regions(horizontal_list, free_list, image_height, barcode_height_ratio=2.0,
+                   barcode_min_aspect=2.0, footer_ratio=None):
+    """
+    detect() 결과에서 인식할 필요 없는 영역 제외
+    - 바코드: 일반 글자보다 훨씬 높고 가로로 긴 영역
+    - 하단 영역: footer_ratio 지정 시 이미지 하단(카드/승인 정보 등)
+    """
+    # 자유 형태 영역은 외접 사각형 기준으로 판단
+    rects = [list(box) for box in horizontal_list]
+    for points in free_list:
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        rects.append([min(xs), max(xs), min(ys), max(ys)])
+    if not rects:
+        return horizontal_list, free_list
+    
+    rects = np.asarray(rects, dtype=np.float64)  # [x_min, x_max, y_min, y_max]
+    widths = rects[:, 1] - rects[:, 0]
+    heights = np.maximum(rects[:, 3] - rects[:, 2], 1)
+    
+    barcode = (heights > np.median(heights) * barcode_height_ratio) & (widths / heights >= barcode_min_aspect)
+    keep = ~barcode
+    if footer_ratio is not None:
+        keep &= (rects[:, 2] + rects[:, 3]) / 2 <= image_height * footer_ratio
+    
+    skipped = len(keep) - int(keep.sum())
+    if skipped:
+        print(f"인식 생략 영역: {skipped}/{len(keep)}개")
+    
+    num_horizontal = len(horizontal_list)
+    return ([box for box, k in zip(horizontal_list, keep[:num_horizontal]) if k],
+            [box for box, k in zip(free_list, keep[num_horizontal:]) if k])
 
-# EasyOCR 모델 전역 초기화
-print("EasyOCR 모델 로드 중...")
-reader = easyocr.Reader(['en', 'ko'], gpu=False)  # 한글/영어 인식, CPU 사용
-print("EasyOCR 모델 로드 완료")
+def readtext_filtered(image):
+    """readtext와 같지만, 검출 후 불필요한 영역을 걸러내고 나머지만 인식 (SKIP_REGIONS 사용 시)"""
+    reader = get_reader()
+    if not SKIP_REGIONS:
+        return reader.readtext(image)
+    
+    horizontal_list, free_list = reader.detect(image)
+    horizontal_list, free_list = filter_regions(horizontal_list[0], free_list[0], image.shape[0],
+                                                **REGION_FILTER_OPTIONS)
+    if not horizontal_list and not free_list:
+        return []
+    
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return reader.recognize(gray, horizontal_list=horizontal_list, free_list=free_list)
+
+def readtext_adaptive(image, fast_scale=0.5, min_confidence=0.5, padding=2, original=None, to_original=None):
+    """
+    2단계 OCR
+    - 축소 이미지로 검출/인식을 빠르게 수행
+    - 신뢰도가 낮은 영역만 원본 해상도 이미지에서 잘라 다시 인식
+    image: 검출/인식용 이미지 (전처리 결과)
+    original: 재인식에 사용할 원본 이미지 (없으면 image), to_original: image 좌표 → original 좌표 변환 행렬
+    반환 결과의 경계 상자는 original 좌표
+    """
+    reader = get_reader()
+    if original is None:
+        original = image
+    if to_original is None:
+        to_original = np.eye(3)
+    small = cv2.resize(image, None, fx=fast_scale, fy=fast_scale, interpolation=cv2.INTER_AREA)
+    fast_result = readtext_filtered(small)
+    if not fast_result:
+        return fast_result
+    
+    # 축소 이미지 좌표 → 원본 이미지 좌표 (축소를 되돌린 뒤 전처리 변환도 되돌림)
+    unscale = np.diag([1 / fast_scale, 1 / fast_scale, 1.0])
+    result = map_result_to_original(fast_result, to_original @ unscale)
+    
+    low_indices = [i for i, (_, _, conf) in enumerate(result) if conf < min_confidence]
+    if not low_indices:
+        return result
+    
+    # 저신뢰 영역을 감싸는 원본 좌표 사각형 목록 [x_min, x_max, y_min, y_max]
+    height, width = original.shape[:2]
+    horizontal_list = []
+    for i in low_indices:
+        xs = [point[0] for point in result[i][0]]
+        ys = [point[1] for point in result[i][0]]
+        horizontal_list.append([max(min(xs) - padding, 0), min(max(xs) + padding, width),
+                                max(min(ys) - padding, 0), min(max(ys) + padding, height)])
+    
+    gray = original if original.ndim == 2 else cv2.cvtColor(original, cv2.COLOR_RGB2GRAY)
+    refined = reader.recognize(gray, horizontal_list=horizontal_list, free_list=[])
+    
+    # recognize는 결과를 위치순으로 재정렬하므로 사각형 좌표로 원래 영역과 대응
+    refined_by_box = {}
+    for bbox, text, conf in refined:
+        refined_by_box[(int(bbox[0][0]), int(bbox[0][1]), int(bbox[2][0]), int(bbox[2][1]))] = (text, conf)
+    
+    for i, (x_min, x_max, y_min, y_max) in zip(low_indices, horizontal_list):
+        refined_item = refined_by_box.get((x_min, y_min, x_max, y_max))
+        if refined_item and refined_item[1] > result[i][2]:  # 재인식 신뢰도가 더 높을 때만 교체
+            result[i] = (result[i][0], refined_item[0], refined_item[1])
+    
+    return result
+
+def decode_image(image_bytes):
+    """이미지 바이트를 RGB 배열로 한 번만 디코딩 (OCR과 시각화가 같은 배열 사용)"""
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:  # OpenCV가 지원하지 않는 형식(GIF 등)은 PIL로 디코딩
+        return np.asarray(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)  # 추가 메모리 없이 제자리 변환
+
+def readtext_image(image):
+    """RGB 배열로 OCR 수행 - 전처리 사용 시 경계 상자를 원본 좌표로 되돌려 반환"""
+    original = image
+    to_original = np.eye(3)
+    if USE_PREPROCESS:
+        image, to_original = preprocess(image, PREPROCESS_OPTIONS)
+    
+    if ADAPTIVE_OCR:
+        # 재인식은 전처리(축소/이진화) 전 원본에서 수행, 결과도 원본 좌표로 반환
+        return readtext_adaptive(image, original=original, to_original=to_original, **ADAPTIVE_OPTIONS)
+    result = readtext_filtered(image)
+    return map_result_to_original(result, to_original)  # 시각화가 원본 이미지 기준이므로 좌표 복원
+
+def run_ocr(image_bytes, image=None, use_cache=True):
+    """
+    OCR 수행 - 같은 내용의 이미지가 캐시에 있으면 디코딩과 OCR 모두 생략
+    image: 이미 디코딩된 RGB 배열 (없으면 OCR이 필요할 때만 디코딩)
+    use_cache: False면 OCR 캐시를 읽지도 쓰지도 않음 (USE_OCR_CACHE가 꺼져 있어도 사용 안 함)
+    """
+    cache = get_ocr_cache() if use_cache else None
+    key = None
+    if cache is not None:
+        key = cache.make_key(image_bytes)  # 이미지 내용 해시 기반 키
+        result = cache.get(key)
+        if result is not None:
+            print("캐시 사용")
+            return result
+    
+    if image is None:
+        image = decode_image(image_bytes)
+    result = readtext_image(image)
+    
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+def warmup():
+    """장시간 실행 서비스용 - 모델과 폰트를 미리 로드"""
+    get_reader()
+    get_font()
 
 def create_output_directories():
-    for path in [INPUT_IMAGE_PATH, OUTPUT_DIR, OCR_VIS_PATH, OCR_RAW_TXT_PATH, JSON_PATH]:
+    for path in [INPUT_IMAGE_PATH, OUTPUT_DIR, OCR_VIS_PATH, OCR_RAW_TXT_PATH, OCR_RECORDS_PATH, JSON_PATH]:
         if not os.path.exists(path):
             os.makedirs(path)  # 없는 폴더 생성
             print(f"'{path}' 폴더가 생성되었습니다.")
@@ -50,7 +275,7 @@ def draw_text_on_original_location(img_draw, bbox, text, font):
         scale_factor = min(box_width / max(text_width, 1), box_height / max(text_height, 1))
         if scale_factor < 1:  # 경계 상자보다 텍스트가 큰 경우
             adjusted_font_size = max(int(font_size * scale_factor * 0.9), 10)  # 최소 10pt
-            adjusted_font = ImageFont.truetype("GmarketSansTTFLight.ttf", adjusted_font_size, encoding="UTF-8")
+            adjusted_font = get_font(adjusted_font_size)  # 크기별 캐시 사용 (박스마다 폰트 파일 재파싱 방지)
             
             # 크기 재계산 (최신 버전만 사용)
             bbox_text = adjusted_font.getbbox(text)
@@ -69,91 +294,233 @@ def draw_text_on_original_location(img_draw, bbox, text, font):
     except Exception as e:
         print(f"텍스트 그리기 오류: {e} (텍스트: {text})")  # 오류 상세 정보 출력
 
-def group_by_y_coordinates(result, threshold=15):
-    if not result:
-        return []
-    
-    # Y 좌표 중앙값 계산
-    def get_y_center(item):
-        bbox = item[0]
-        y_values = [point[1] for point in bbox]
-        return sum(y_values) / len(y_values)  # Y 좌표 평균
+def boxes_to_array(result):
+    """readtext 결과의 경계 상자들을 (N, 4, 2) 배열로 변환"""
+    coords = chain.from_iterable(chain.from_iterable(item[0] for item in result))
+    return np.fromiter(coords, dtype=np.float64, count=len(result) * 8).reshape(-1, 4, 2)
+
+def group_boxes(boxes, threshold=None, height_ratio=LINE_HEIGHT_RATIO):
+    """
+    (N, 4, 2) 경계 상자 배열을 줄 단위로 묶어 (정렬 순서, 줄 번호) 배열로 반환
+    - 중심/높이를 배열 연산으로 한 번에 계산
+    - 줄의 첫 상자(기준점)와 Y 중심 차이가 임계값보다 크면 새 줄 (임계값 기본값 = 글자 높이 중앙값 × height_ratio)
+      이웃 상자끼리의 간격으로 판단하면 기울어진 영수증에서 여러 줄이 한 줄로 이어지므로 기준점과 비교
+    - 같은 줄 안에서는 X 좌표 순 (품명/단가/금액 열이 떨어져 있어도 한 줄로 유지)
+    order[k]: k번째 토큰의 상자 인덱스, line_ids[k]: k번째 토큰의 줄 번호
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
     
-    sorted_result = sorted(result, key=get_y_center)  # Y 좌표로 정렬
+    ys = boxes[:, :, 1]
+    y_centers = ys.mean(axis=1)  # Y 좌표 평균
+    x_mins = boxes[:, :, 0].min(axis=1)
     
-    # 같은 줄 텍스트 그룹화
-    groups = []
-    current_group = [sorted_result[0]]
-    current_y = get_y_center(sorted_result[0])
+    # 해상도에 맞춰 임계값 결정 (고해상도 스캔에서도 같은 기준)
+    if threshold is None:
+        heights = ys.max(axis=1) - ys.min(axis=1)
+        threshold = max(float(np.median(heights)) * height_ratio, 1.0)
     
-    for item in sorted_result[1:]:
-        y_center = get_y_center(item)
-        if abs(y_center - current_y) <= threshold:  # 같은 줄로 간주할 Y 차이 임계값
-            current_group.append(item)
-        else:
-            groups.append(current_group)  # 현재 그룹 저장
-            current_group = [item]  # 새 그룹 시작
-            current_y = y_center  # Y 기준점 갱신
+    # Y 중심으로 정렬 후 한 번 훑으면서 기준점과의 차이가 임계값을 넘으면 새 줄 시작
+    y_order = np.argsort(y_centers, kind='stable')
+    sorted_lines = np.empty(len(y_order), dtype=np.intp)
+    sorted_centers = y_centers[y_order].tolist()
+    line_id = 0
+    anchor = sorted_centers[0]
+    for k, y_center in enumerate(sorted_centers):
+        if y_center - anchor > threshold:
+            line_id += 1
+            anchor = y_center  # 새 줄의 기준점
+        sorted_lines[k] = line_id
     
-    if current_group:  # 마지막 그룹 추가
-        groups.append(current_group)
+    # 줄 번호 → X 좌표 순으로 최종 정렬 (X가 같으면 Y 순서 유지)
+    order = y_order[np.lexsort((x_mins[y_order], sorted_lines))]
+    line_of = np.empty(len(y_order), dtype=np.intp)
+    line_of[y_order] = sorted_lines
+    return order, line_of[order]
+
+def group_lines(result, threshold=None, height_ratio=LINE_HEIGHT_RATIO):
+    """readtext 결과를 줄 단위로 묶어 (정렬 순서, 줄 번호) 배열로 반환"""
+    if not result:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return group_boxes(boxes_to_array(result), threshold, height_ratio)
+
+def group_by_y_coordinates(result, threshold=None):
+    """줄 단위 그룹 목록 반환 (각 그룹은 X 좌표 순으로 정렬됨)"""
+    if not result:
+        return []
     
-    return groups
+    order, line_ids = group_lines(result, threshold)
+    boundaries = np.flatnonzero(np.diff(line_ids)) + 1  # 줄이 바뀌는 위치
+    return [[result[i] for i in chunk] for chunk in np.split(order, boundaries)]
 
 def save_text_with_groups(filepath, grouped_result):
-    lines = []
-    
-    for group in grouped_result:
-        # X 좌표로 정렬 (왼쪽→오른쪽 순)
-        sorted_group = sorted(group, key=lambda x: min(point[0] for point in x[0]))
-        line_text = " ".join(item[1] for item in sorted_group)  # 그룹 내 텍스트 합치기
-        line_text = re.sub(r'\b\d{10,}\b', '', line_text)  # 바코드 등 긴 숫자 제거
-        lines.append(line_text)
-    
-    # 파일 저장
-    with open(filepath, 'w', encoding='utf-8') as f:
-        for line in lines:
-            if line.strip():  # 빈 줄은 저장하지 않음
-                f.write(f"{line}\n")
+    # 레코드로 변환 후 텍스트 뷰 저장 (긴 숫자 제거, 빈 줄 제외)
+    result = [item for group in grouped_result for item in group]
+    line_ids = [line_id for line_id, group in enumerate(grouped_result) for _ in group]
+    record = build_record(os.path.basename(filepath), result, range(len(result)), line_ids)
+    save_text_view(filepath, record)
 
-def process_single_image(image_path):
+def should_visualize(filename):
+    """시각화 모드에 따라 이 이미지를 시각화할지 결정 (sample 모드는 파일명 기준으로 항상 같은 결과)"""
+    if VIS_MODE == "all":
+        return True
+    if VIS_MODE == "sample":
+        return zlib.crc32(filename.encode("utf-8")) % 10000 < VIS_SAMPLE_RATE * 10000
+    return False
+
+def get_vis_executor():
+    """시각화 전용 백그라운드 스레드 풀 반환 - 최초 호출 시 생성"""
+    global _vis_executor, _vis_slots
+    if _vis_executor is None:
+        _vis_executor = ThreadPoolExecutor(max_workers=VIS_WORKERS, thread_name_prefix="ocr_vis")
+        _vis_slots = threading.BoundedSemaphore(VIS_MAX_PENDING)
+    return _vis_executor
+
+def submit_visualization(image, result, result_img_path):
+    """시각화 작업 등록 - 대기 중인 작업이 VIS_MAX_PENDING개면 하나가 끝날 때까지 기다림"""
+    executor = get_vis_executor()
+    slots = _vis_slots
+    slots.acquire()
     try:
-        result = reader.readtext(image_path)  # OCR 수행
-        
-        if not result:
-            print(f"텍스트 없음: {image_path}")
-            return []
-        
-        # 이미지 처리
-        img = Image.open(image_path)
-        if img.mode not in ['RGB', 'RGBA']:
-            img = img.convert('RGB')  # 흑백 이미지를 RGB로 변환
+        future = executor.submit(save_visualization, image, result, result_img_path)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+def wait_for_visualizations():
+    """대기 중인 시각화 작업이 모두 끝날 때까지 기다림"""
+    global _vis_executor, _vis_slots
+    if _vis_executor is not None:
+        _vis_executor.shutdown(wait=True)
+        _vis_executor = None
+        _vis_slots = None
+
+def save_visualization(image, result, result_img_path):
+    """인식 결과를 원본 이미지 위에 그려서 저장 (백그라운드 스레드에서 실행)"""
+    try:
+        img = Image.fromarray(image)  # 디코딩된 RGB 배열로 그리기 (재디코딩 없음)
         draw = ImageDraw.Draw(img)
         
         # 인식된 텍스트 시각화
+        font = get_font()
         for bbox, text_data, _ in result:
             if text_data.strip():  # 공백 텍스트 제외
                 draw_text_on_original_location(draw, bbox, text_data, font)
         
+        img.save(result_img_path)
+    except Exception as e:
+        print(f"시각화 저장 실패: {e} ({result_img_path})")
+
+def process_single_image(image_path):
+    try:
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+        
         # 파일명 처리
         base_filename = os.path.basename(image_path)
         filename_without_ext = os.path.splitext(base_filename)[0]
         
-        # 시각화 이미지 저장
-        result_img_path = os.path.join(OCR_VIS_PATH, f"{filename_without_ext}_vis.png")
-        img.save(result_img_path)
+        # 시각화할 이미지만 미리 디코딩해서 OCR과 같은 배열 공유
+        visualize = should_visualize(base_filename)
+        image = decode_image(image_bytes) if visualize else None
+        result = run_ocr(image_bytes, image)  # OCR 수행 (캐시 우선)
         
-        # 인식된 텍스트 저장
+        if not result:
+            print(f"텍스트 없음: {image_path}")
+            return []
+        
+        # 시각화는 OCR을 막지 않도록 백그라운드에서 저장
+        if visualize:
+            result_img_path = os.path.join(OCR_VIS_PATH, f"{filename_without_ext}_vis.png")
+            submit_visualization(image, result, result_img_path)
+        
+        # 인식 결과를 구조화 레코드로 저장하고, 텍스트는 레코드에서 생성
+        order, line_ids = group_lines(result)  # 텍스트 줄 단위 그룹화
+        record = build_record(base_filename, result, order, line_ids)
+        save_record(os.path.join(OCR_RECORDS_PATH, f"{filename_without_ext}.jsonl"), record)
         txt_path = os.path.join(OCR_RAW_TXT_PATH, f"{filename_without_ext}_raw.txt")
-        grouped_result = group_by_y_coordinates(result)  # 텍스트 줄 단위 그룹화
-        save_text_with_groups(txt_path, grouped_result)  # 텍스트 파일로 저장
+        save_text_view(txt_path, record)  # 텍스트 파일로 저장
         
         return result
     except Exception as e:
         print(f"처리 실패: {e}")
         return []
 
-def main():
+def _get_settings():
+    """워커에 전달할 현재 실행 옵션"""
+    return {
+        "use_cache": USE_OCR_CACHE,
+        "use_preprocess": USE_PREPROCESS,
+        "adaptive": ADAPTIVE_OCR,
+        "skip_regions": SKIP_REGIONS,
+        "vis_mode": VIS_MODE,
+        "vis_sample_rate": VIS_SAMPLE_RATE,
+        # 단계별 옵션 (spawn/forkserver 워커는 부모에서 바꾼 값을 물려받지 못하므로 함께 전달)
+        "preprocess_options": dict(PREPROCESS_OPTIONS),
+        "adaptive_options": dict(ADAPTIVE_OPTIONS),
+        "region_filter_options": dict(REGION_FILTER_OPTIONS),
+    }
+
+def _apply_settings(use_cache=True, use_preprocess=False, adaptive=False, skip_regions=False,
+                    vis_mode="off", vis_sample_rate=VIS_SAMPLE_RATE, preprocess_options=None,
+                    adaptive_options=None, region_filter_options=None):
+    global USE_OCR_CACHE, USE_PREPROCESS, ADAPTIVE_OCR, SKIP_REGIONS, VIS_MODE, VIS_SAMPLE_RATE, _ocr_cache
+    USE_OCR_CACHE = use_cache
+    USE_PREPROCESS = use_preprocess
+    ADAPTIVE_OCR = adaptive
+    SKIP_REGIONS = skip_regions
+    VIS_MODE = vis_mode
+    VIS_SAMPLE_RATE = vis_sample_rate
+    # 옵션 dict는 제자리에서 갱신 (다른 모듈이 참조하는 dict 객체 유지)
+    for options, values in ((PREPROCESS_OPTIONS, preprocess_options), (ADAPTIVE_OPTIONS, adaptive_options),
+                            (REGION_FILTER_OPTIONS, region_filter_options)):
+        if values is not None:
+            options.update(values)
+    _ocr_cache = None  # 캐시 키에 옵션이 들어가므로 바뀐 옵션으로 다시 생성
+
+def _init_worker(num_threads, settings):
+    """병렬 처리용 워커 초기화 - 워커마다 Reader를 한 번만 생성해서 재사용"""
+    _apply_settings(**settings)
+    import torch
+    torch.set_num_threads(num_threads)  # 워커별 intra-op 스레드 수 제한 (코어 과다 사용 방지)
+    warmup()
+
+def _process_in_worker(image_path):
+    # 워커에서는 결과 대신 성공 여부만 반환 (프로세스 간 전송 최소화)
+    try:
+        return bool(process_single_image(image_path))
+    finally:
+        # 작업이 끝나기 전에 시각화 저장도 마침 (풀 종료 시 워커는 atexit 없이 종료되므로 남기지 않음)
+        wait_for_visualizations()
+
+def process_images_parallel(image_paths, workers):
+    """이미지 목록을 프로세스 풀로 병렬 처리하고 성공 개수 반환"""
+    num_threads = max(1, (os.cpu_count() or 1) // workers)  # 워커당 torch 스레드 수
+    print(f"병렬 처리: 워커 {workers}개, 워커당 스레드 {num_threads}개")
+    
+    success_count = 0
+    total_count = len(image_paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(num_threads, _get_settings())) as executor:
+        futures = {executor.submit(_process_in_worker, path): path for path in image_paths}
+        for idx, future in enumerate(as_completed(futures), 1):
+            image = os.path.basename(futures[future])
+            try:
+                if future.result():  # OCR 성공 시
+                    success_count += 1
+                    print(f"성공: {image} [{idx}/{total_count}]")
+                else:
+                    print(f"실패: {image} [{idx}/{total_count}]")  # 인식된 텍스트 없음
+            except Exception as e:
+                print(f"오류: {e}")  # 워커 처리 중 예외 발생
+    
+    return success_count
+
+def main(workers=1, use_cache=True, use_preprocess=False, adaptive=False, skip_regions=False,
+         vis_mode="off", vis_sample_rate=VIS_SAMPLE_RATE):
+    _apply_settings(use_cache, use_preprocess, adaptive, skip_regions, vis_mode, vis_sample_rate)
     print("EasyOCR 텍스트 인식 시작...")
     
     # 출력 디렉토리 생성
@@ -167,12 +534,19 @@ def main():
         print(f"'{INPUT_IMAGE_PATH}' 폴더에 이미지 없음")
         return
     
-    # 이미지 순차 처리
     success_count = 0
     total_count = len(image_files)
     
     print(f"총 {total_count}개 이미지 처리 예정")
     
+    # 워커가 2개 이상이면 병렬 처리
+    if workers > 1:
+        image_paths = [os.path.join(INPUT_IMAGE_PATH, image) for image in image_files]
+        success_count = process_images_parallel(image_paths, min(workers, total_count))
+        print(f"\n완료: {success_count}/{total_count} 성공")
+        return
+    
+    # 이미지 순차 처리
     for idx, image in enumerate(image_files, 1):
         try:
             image_path = os.path.join(INPUT_IMAGE_PATH, image)
@@ -186,7 +560,39 @@ def main():
         except Exception as e:
             print(f"오류: {e}")  # 처리 중 예외 발생
     
+    wait_for_visualizations()  # 백그라운드 시각화 저장 완료 대기
     print(f"\n완료: {success_count}/{total_count} 성공")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="영수증 이미지 OCR 텍스트 추출")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="병렬 처리 워커 수 (1이면 순차 처리)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="OCR 결과 캐시를 사용하지 않고 항상 새로 인식")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="OCR 전에 축소/흑백/이진화/기울기 보정 전처리 수행")
+    parser.add_argument("--max-side", type=int, default=PREPROCESS_OPTIONS["max_side"],
+                        help="--preprocess 사용 시 긴 변 최대 픽셀 (0이면 축소 안 함)")
+    parser.add_argument("--no-binarize", action="store_true", help="--preprocess 사용 시 이진화 생략")
+    parser.add_argument("--no-deskew", action="store_true", help="--preprocess 사용 시 기울기 보정 생략")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="축소 이미지로 먼저 인식하고 저신뢰 영역만 원본 해상도로 재인식")
+    parser.add_argument("--min-confidence", type=float, default=ADAPTIVE_OPTIONS["min_confidence"],
+                        help="--adaptive 사용 시 재인식 대상 신뢰도 기준")
+    parser.add_argument("--skip-regions", action="store_true",
+                        help="검출 후 바코드 등 불필요한 영역은 인식하지 않음")
+    parser.add_argument("--footer-ratio", type=float, default=None,
+                        help="--skip-regions 사용 시 이미지 높이의 이 비율 아래 영역도 인식 생략 (예: 0.8)")
+    parser.add_argument("--vis", choices=["off", "sample", "all"], default=VIS_MODE,
+                        help="OCR 시각화 이미지 저장 범위")
+    parser.add_argument("--vis-sample-rate", type=float, default=VIS_SAMPLE_RATE,
+                        help="--vis sample 사용 시 시각화할 이미지 비율 (0~1)")
+    args = parser.parse_args()
+    
+    PREPROCESS_OPTIONS["max_side"] = args.max_side
+    PREPROCESS_OPTIONS["binarize"] = not args.no_binarize
+    PREPROCESS_OPTIONS["deskew"] = not args.no_deskew
+    ADAPTIVE_OPTIONS["min_confidence"] = args.min_confidence
+    REGION_FILTER_OPTIONS["footer_ratio"] = args.footer_ratio
+    main(workers=args.workers, use_cache=not args.no_cache, use_preprocess=args.preprocess,
+         adaptive=args.adaptive, skip_regions=args.skip_regions, vis_mode=args.vis, vis_sample_rate=args.vis_sample_rate)
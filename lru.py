@@ -0,0 +1,34 @@
+from collections import OrderedDict
+
+"""
+LRU 캐시 모듈
+- 최근 사용한 항목만 메모리에 보관하는 크기 제한 dict
+- 메뉴 검색 인덱스(process_text), 카탈로그 메뉴 목록(store_catalog), 교정 결과(correction_cache)에서 공통 사용
+"""
+
+
+class LRUCache:
+    """최근 사용한 max_entries개 항목만 보관하는 dict (가장 오래 사용하지 않은 항목부터 삭제)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
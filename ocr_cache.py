@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+
+"""
+OCR 결과 캐시 모듈
+- 이미지 내용 해시 + Reader 설정을 키로 readtext 결과를 디스크에 저장
+- 같은 이미지가 다시 들어오면 OCR을 건너뛰고 저장된 결과 사용
+- 전체 용량이 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+  (용량은 저장한 만큼 더해서 추정하고, 추정치가 상한을 넘을 때만 폴더를 훑어서 정리)
+"""
+
+DEFAULT_CACHE_DIR = os.path.join("output", "ocr_cache")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200MB
+CACHE_VERSION = 1  # 저장 형식이 바뀌면 올려서 기존 캐시 무효화
+EVICT_TARGET_RATIO = 0.9  # 정리할 때 상한의 이 비율까지 줄임 (상한 근처에서 저장할 때마다 폴더를 훑지 않도록)
+
+
+def _to_number(value):
+    """numpy 정수/실수를 JSON 저장 가능한 파이썬 숫자로 변환 (정수값은 int 유지)"""
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
+class OCRCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, config=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_size = None  # 캐시 용량 추정치 (마지막으로 훑은 값 + 이후 이 프로세스가 저장한 크기)
+        # Reader 언어/옵션이 다르면 다른 키가 되도록 설정을 정규화해서 보관
+        self.config_key = json.dumps(config or {}, sort_keys=True, ensure_ascii=False)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, image_bytes):
+        """이미지 바이트 + Reader 설정으로 캐시 키 생성"""
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}|{self.config_key}|".encode("utf-8"))
+        h.update(image_bytes)
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """캐시된 readtext 결과 반환, 없으면 None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            os.utime(path)  # 접근 시각 갱신 (LRU 기준)
+        except (OSError, ValueError):
+            return None
+
+        # [x1,y1,...,x4,y4, text, conf] → ([[x,y]*4], text, conf)
+        return [([entry[0:2], entry[2:4], entry[4:6], entry[6:8]], entry[8], entry[9])
+                for entry in entries]
+
+    def put(self, key, result):
+        """readtext 결과를 압축된 형태로 저장"""
+        entries = []
+        for bbox, text, conf in result:
+            coords = [_to_number(v) for point in bbox for v in point]  # 좌표 8개를 한 줄로 평탄화
+            entries.append(coords + [text, round(float(conf), 4)])
+
+        data = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # 병렬 워커끼리 덮어써도 깨지지 않도록 원자적 교체
+        except OSError as e:
+            print(f"캐시 저장 오류: {e}")
+            return
+
+        self._evict(len(data))
+
+    def _evict(self, written):
+        """
+        용량 추정치가 상한을 넘으면 폴더를 훑어서 실제 용량을 구하고, 상한을 넘었으면 오래된 항목부터 삭제
+        - 추정치는 덮어쓴 항목도 새 항목으로 셈 (다른 프로세스가 저장한 항목은 그 프로세스의 추정치로 정리)
+        - 상한의 EVICT_TARGET_RATIO까지 줄여서 다음 정리까지 여유를 둠
+        """
+        if self._total_size is not None:
+            self._total_size += written
+            if self._total_size <= self.max_bytes:
+                return
+
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # 다른 프로세스가 이미 삭제함
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        if total_size > self.max_bytes:
+            target = self.max_bytes * EVICT_TARGET_RATIO
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                if total_size <= target:
+                    break
+        self._total_size = total_size
@@ -0,0 +1,87 @@
+import os
+import re
+import json
+
+"""
+OCR 구조화 결과(레코드) 모듈
+- 영수증 1장 = 레코드 1개 (JSONL 한 줄)
+- 토큰마다 텍스트, 경계 상자, 신뢰도, 줄 번호 보관
+- ocr_raw_txt의 텍스트는 레코드에서 만들어지는 뷰
+"""
+
+LONG_NUMBER_PATTERN = re.compile(r'\b\d{10,}\b')  # 바코드 등 긴 숫자
+
+
+def build_record(image_name, result, order, line_ids):
+    """
+    readtext 결과를 레코드로 변환
+    order: 토큰 순서대로의 result 인덱스, line_ids: 각 토큰의 줄 번호 (group_lines 결과)
+    """
+    tokens = []
+    for index, line_id in zip(order, line_ids):
+        bbox, text, conf = result[index]
+        tokens.append({
+            "text": text,
+            "bbox": [int(round(float(v))) for point in bbox for v in point],  # x1,y1,...,x4,y4
+            "conf": round(float(conf), 4),
+            "line": int(line_id),
+        })
+    return {"image": image_name, "tokens": tokens}
+
+
+def record_lines(record, min_confidence=0.0):
+    """레코드를 텍스트 줄 목록으로 변환 (min_confidence 미만 토큰 제외, 빈 줄 제외)"""
+    if "lines" in record:  # 후처리된 줄이 있으면 그대로 사용
+        return list(record["lines"])
+
+    lines = []
+    current_line = None
+    texts = []
+    for token in record["tokens"]:
+        if token["line"] != current_line:
+            if texts:
+                lines.append(" ".join(texts))
+            current_line = token["line"]
+            texts = []
+        if token["conf"] >= min_confidence:
+            texts.append(token["text"])
+    if texts:
+        lines.append(" ".join(texts))
+
+    lines = [LONG_NUMBER_PATTERN.sub('', line) for line in lines]
+    return [line for line in lines if line.strip()]
+
+
+def save_record(filepath, record):
+    """레코드를 JSONL 파일로 저장 (폴더가 없으면 생성)"""
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        f.write("\n")
+
+
+def load_records(filepath):
+    """JSONL 파일의 레코드를 순서대로 반환 (여러 영수증을 이어 붙인 파일도 지원)"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_lines(filepath, min_confidence=0.0):
+    """txt 또는 레코드(.jsonl) 파일에서 텍스트 줄 목록 읽기"""
+    if filepath.endswith('.jsonl'):
+        lines = []
+        for record in load_records(filepath):
+            lines.extend(record_lines(record, min_confidence))
+        return lines
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+
+def save_text_view(filepath, record):
+    """레코드에서 텍스트 뷰(ocr_raw_txt 형식) 생성해서 저장 (폴더가 없으면 생성)"""
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for line in record_lines(record):
+            f.write(f"{line}\n")
@@ -1,7 +1,20 @@
 import re
 import os
 import json
+import sqlite3
+import hashlib
+import threading
 import Levenshtein
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from fuzzy_index import JamoWordIndex, JamoNgramIndex, PrefixMatcher, BatchMatcher, SIMILARITY_EPSILON
+from ocr_record import load_lines, record_lines
+from dictionary_artifact import load_artifact
+from text_rules import DEFAULT_RULES_PATH, load_rules
+from correction_cache import CorrectionCache, DEFAULT_CACHE_PATH as DEFAULT_CORRECTION_CACHE_PATH
+from lru import LRUCache
+from store_catalog import CATALOG_EXTENSIONS, DEFAULT_HOT_STORES, StoreCatalog
 
 """
 영수증 텍스트 후처리 모듈
@@ -10,18 +23,53 @@ import Levenshtein
 - 메뉴명과 가격 정보 정규화
 """
 
+QUERY_JAMO_CACHE_SIZE = 65536  # 질의 단어 자모 분해 결과 캐시 크기
+DIRECTORY_BATCH_SIZE = 256  # process_directory에서 한 번에 묶어서 교정할 파일 수
+STREAM_BATCH_LINES = 1024  # process_stream에서 한 번에 묶어서 교정할 줄 수 (메모리 상한)
+NUMBER_LINE_PATTERN = re.compile(r'^[\d,.\s OlI]+$')  # 숫자와 특수문자로만 구성된 줄
+STORE_SHORTLIST_SIZE = 32  # 가게명 매칭 시 n-gram 역색인으로 먼저 비교하는 후보 수
+STORE_NGRAM_MIN_STORES = 5000  # 가게가 이보다 적으면 n-gram 역색인 없이 전체 비교 (작은 목록은 전체 비교가 더 빠름)
+TASKS_PER_WORKER = 4  # 병렬 처리 시 워커당 작업 묶음 수 (묶음이 너무 크면 워커 간 부하 불균형)
+
+_worker_processor = None  # 병렬 처리 워커의 후처리기 (fork면 부모의 사전/인덱스를 그대로 공유)
+_registry = {}  # (사전 절대 경로, 옵션) → [후처리기, (수정 시각, 크기), 내용 해시]
+_registry_lock = threading.Lock()
+
+class StoreDict(dict):
+    """
+    JSON 사전의 가게 사전 (가게명 → 가게 정보 dict)
+    가게 사전 아티팩트(MappedStores), 카탈로그(StoreCatalog)와 같은 store_items/store_info로 조회
+    """
+
+    def __init__(self, stores=(), decompose=None):
+        super().__init__(stores)
+        # 메뉴명은 로드 시점에 한 번만 자모 분해
+        self.items_jamo = {store_name: [decompose(item) for item in info.get("items", [])]
+                           for store_name, info in self.items()}
+
+    def store_items(self, store_name):
+        """가게의 (메뉴 목록, 메뉴 자모 목록) 반환, 없는 가게면 None"""
+        if store_name not in self:
+            return None
+        return self[store_name].get("items", []), self.items_jamo[store_name]
+
+    def store_info(self, store_name):
+        """가게 정보 dict (메뉴 포함) 또는 None"""
+        return self.get(store_name)
+
 class TextPostProcessor:
-    def __init__(self, dict_path="dictionary.txt"):
+    def __init__(self, dict_path="dictionary.txt", use_artifact=True, rules_path=DEFAULT_RULES_PATH,
+                 correction_cache_path=DEFAULT_CORRECTION_CACHE_PATH, hot_stores=DEFAULT_HOT_STORES):
         self.dict_path = dict_path
-        self.store_item_path = dict_path.endswith('.json')
+        self.store_catalog_path = dict_path.endswith(CATALOG_EXTENSIONS)  # SQLite 가게/메뉴 카탈로그
+        self.store_item_path = dict_path.endswith('.json') or self.store_catalog_path
+        self.hot_stores = hot_stores  # 메뉴 목록/메뉴 검색 인덱스를 메모리에 보관할 최근 가게 수
         
-        # 파일 타입에 따라 다른 로딩 방식 사용
-        if self.store_item_path:
-            self._load_json_dictionary()
-        else:
-            self._load_text_dictionary()
+        # 텍스트 정리/숫자 보정 규칙 표 (단계별로 한 번의 스캔으로 적용되도록 컴파일)
+        self.rules_path = rules_path
+        self.rules = load_rules(rules_path)
         
-        # 한글 자모 매핑 테이블
+        # 한글 자모 매핑 테이블 (사전 로드 시 자모 분해에 필요하므로 먼저 설정)
         self.chosung_list = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 
                              'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
         self.jungsung_list = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 
@@ -30,78 +78,250 @@ class TextPostProcessor:
                               'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 
                               'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
         
+        # 질의 단어 자모 분해 결과 메모 (같은 OCR 단어가 반복해서 들어옴)
+        self._decompose_cached = lru_cache(maxsize=QUERY_JAMO_CACHE_SIZE)(self._decompose)
+        
+        # 사전 상태 기본값 (로더는 읽은 부분만 덮어씀)
+        self.dictionary = []
+        self.dictionary_jamo = []
+        self.dictionary_version = None  # 교정 캐시 키 (원본 사전 해시)
+        self.word_index = JamoWordIndex([], [])
+        # 가게 사전: StoreDict(JSON), MappedStores(아티팩트), StoreCatalog(카탈로그) 모두 store_items/store_info로 조회
+        self.stores = StoreDict()
+        self.store_names = []
+        self.store_names_jamo = []
+        self.store_index = None  # 가게명 전체 비교용 인덱스 (없으면 처음 필요할 때 생성)
+        self.store_ngram_index = None  # 가게명 n-gram 역색인 (가게가 많을 때 처음 조회하면서 생성)
+        self.item_indexes = LRUCache(hot_stores)  # 가게명 → 메뉴 후보 검색 인덱스 (처음 조회할 때 생성)
+        self.item_prefix_matchers = LRUCache(hot_stores)  # 가게명 → 메뉴 구문 누적 매칭 상태 (처음 조회할 때 생성)
+        
+        # 카탈로그는 SQLite에서 바로 읽고, 그 외에는 컴파일된 아티팩트(mmap)를 우선 사용, 실패하면 원본 사전을 직접 파싱
+        if self.store_catalog_path:
+            self._load_catalog()
+        elif not (use_artifact and self._load_artifact()):
+            # 파일 타입에 따라 다른 로딩 방식 사용
+            if self.store_item_path:
+                self._load_json_dictionary()
+            else:
+                self._load_text_dictionary()
+        
+        # 여러 단어 일괄 교정용 (사전 글자 수/비교 열 묶음을 한 번만 준비, 글자 수는 인덱스에서 계산)
+        self.batch_matcher = BatchMatcher(self.dictionary_jamo, self.word_index.word_lengths())
+        
+        # 단어 교정 결과 캐시 (사전 버전별로 실행/프로세스 간 공유, None이면 사용 안 함)
+        self.correction_cache_path = correction_cache_path
+        self.correction_cache = None
+        if correction_cache_path and self.dictionary:
+            self.correction_cache = CorrectionCache(self.dictionary_version, correction_cache_path)
+        
         print(f"텍스트 후처리기 초기화 완료")
 
+    def _load_artifact(self):
+        """사전 아티팩트를 mmap으로 열어서 단어/자모/인덱스 설정 (원본이 바뀌었으면 다시 컴파일)"""
+        try:
+            artifact = load_artifact(self.dict_path, self._decompose)
+        except Exception as e:
+            print(f"사전 아티팩트 로드 오류: {e}")
+            return False
+        
+        if self.store_item_path:
+            # 가게 정보/메뉴는 mmap된 배열에서 필요할 때만 읽음
+            self.stores, self.store_names, self.store_names_jamo, self.store_index = artifact.stores()
+            print(f"{len(self.stores)}개 가게 정보 로드됨 (아티팩트)")
+        else:
+            self.dictionary, self.dictionary_jamo, self.word_index = artifact.word_list("dictionary")
+            self.dictionary_version = artifact.source["sha256"]
+            print(f"{len(self.dictionary)}개 단어 로드됨 (아티팩트)")
+        return True
+    
+    def _load_catalog(self):
+        """SQLite 카탈로그 로딩 - 가게명/자모만 읽고, 메뉴는 매칭된 가게만 필요할 때 읽음"""
+        try:
+            catalog = StoreCatalog(self.dict_path, self.hot_stores)
+            self.store_names, self.store_names_jamo = catalog.store_names()
+        except (sqlite3.Error, OSError, ValueError) as e:
+            print(f"카탈로그 로드 오류: {e}")
+            return
+        # 전체 가게 정보는 메모리에 올리지 않음 (카탈로그의 store_items/store_info로 조회)
+        self.stores = catalog
+        self.store_ngram_index = catalog.ngram_index()
+        # 전체 비교용 인덱스는 가게가 적을 때만 바로 생성 (많으면 n-gram 역색인 후보로 확정되지 않는 질의가 처음 나올 때 생성)
+        if len(self.store_names) < STORE_NGRAM_MIN_STORES:
+            self.store_index = JamoWordIndex(self.store_names, self.store_names_jamo)
+        print(f"{len(self.store_names)}개 가게 정보 로드됨 (카탈로그)")
+
     def _load_text_dictionary(self):
         """텍스트 파일 로딩 - dictionary만 생성"""
-        self.stores_dict = {}
         try:
             with open(self.dict_path, 'r', encoding='utf-8') as f:
                 self.dictionary = [line.strip() for line in f if line.strip()]
+            with open(self.dict_path, 'rb') as f:
+                self.dictionary_version = hashlib.sha256(f.read()).hexdigest()  # 교정 캐시 키 (아티팩트와 동일)
             print(f"{len(self.dictionary)}개 단어 로드됨")
         except Exception as e:
             print(f"사전 로드 오류: {e}")
             self.dictionary = []
+        self._build_jamo_tables()
 
     def _load_json_dictionary(self):
-        """JSON 파일 로딩 - stores_dict만 생성"""
-        self.dictionary = []
+        """JSON 파일 로딩 - 가게 사전만 생성"""
+        stores = {}
         try:
             with open(self.dict_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                self.stores_dict = data.get("stores", {})
-            print(f"{len(self.stores_dict)}개 가게 정보 로드됨")
+                stores = data.get("stores", {})
+            print(f"{len(stores)}개 가게 정보 로드됨")
         except Exception as e:
             print(f"JSON 사전 로드 오류: {e}")
-            self.stores_dict = {}
+        self.stores = StoreDict(stores, self._decompose)
+        self._build_jamo_tables()
+
+    def _build_jamo_tables(self):
+        """사전 단어/가게명/메뉴명을 로드 시점에 한 번만 자모 분해해서 보관"""
+        self.dictionary_jamo = [self._decompose(word) for word in self.dictionary]
+        self.word_index = JamoWordIndex(self.dictionary, self.dictionary_jamo)  # find_closest_word 후보 검색
+        self.store_names = list(self.stores)
+        self.store_names_jamo = [self._decompose(store_name) for store_name in self.store_names]
+        self.store_index = JamoWordIndex(self.store_names, self.store_names_jamo)
+
+    def _best_match(self, target, words, words_jamo, index, threshold):
+        """
+        사전 단어 중 target과 가장 유사한 단어와 유사도 반환
+        - 인덱스가 돌려준 후보를 유사도 상한이 높은 순으로 비교
+        - 남은 후보의 상한이 현재 최고 유사도보다 낮으면 즉시 중단
+        - 같은 유사도면 더 긴 단어, 그것도 같으면 사전에서 먼저 나온 단어 선택 (전체 순회와 동일)
+        """
+        target_jamo = self.decompose_hangul(target)
+        best_match = None
+        max_similarity = 0
+        best_key = (0, 0, float('-inf'))  # (유사도, 길이, -사전 순서)
+        
+        for upper, i in index.ranked_candidates(target, target_jamo, threshold):
+            if upper + SIMILARITY_EPSILON < max_similarity:
+                break  # 이후 후보는 현재 최고 유사도를 넘을 수 없음
+            candidate = words[i]
+            similarity = self._jamo_similarity(target, target_jamo, candidate, words_jamo[i])
+            key = (similarity, len(candidate), -i)
+            if key > best_key:
+                best_key = key
+                best_match = candidate
+                max_similarity = similarity
+        
+        return best_match, max_similarity
 
     def load_dictionary(self, dict_path):
         """기존 호환성을 위한 메서드"""
         return self._load_text_dictionary() if dict_path.endswith('.txt') else self._load_json_dictionary()
 
-    def find_best_store_match(self, target, threshold=0.4):
-        """가게명에서 가장 유사한 매치 찾기 (JSON 전용)"""
-        if not self.store_item_path or not self.stores_dict:
+    def find_best_store_match(self, target, threshold=0.4, shortlist=STORE_SHORTLIST_SIZE):
+        """
+        가게명에서 가장 유사한 매치 찾기 (JSON/카탈로그 전용)
+        가게가 STORE_NGRAM_MIN_STORES개 이상이면 자모 3-gram 역색인으로 공유 n-gram이 많은 shortlist개를 먼저 비교
+        - 후보 최고 유사도 이상이 될 수 있는 가게를 q-gram 개수 조건으로 역색인에서 모두 찾을 수 있으면
+          그 가게들만 추가로 비교 (가게 수와 거의 무관한 비용)
+        - 조건으로 걸러낼 수 없으면(후보 최고 유사도가 낮은 OCR 줄/단어, 2글자 이하 가게명) 전체 비교로 확인
+          (후보 최고 유사도보다 상한이 낮은 가게는 건너뜀)
+        어느 경우든 결과(임계값, 동점 처리 포함)는 전체 비교와 동일, shortlist=None이면 항상 전체 비교
+        """
+        if not self.store_item_path or not self.store_names:
             return None, 0
-            
+        
+        if shortlist is None or len(self.store_names) < max(STORE_NGRAM_MIN_STORES, shortlist + 1):
+            best_match, max_similarity = self._best_store_exact(target, threshold)
+        else:
+            best_match, max_similarity, complete = self._best_store_in_shortlist(target, threshold, shortlist)
+            if not complete:
+                # 후보 최고 유사도 이상이 될 수 있는 가게만 비교 (후보 최고 가게도 여기에 포함됨)
+                exact_match, exact_similarity = self._best_store_exact(target, max(threshold, max_similarity))
+                if exact_match is not None:
+                    best_match, max_similarity = exact_match, exact_similarity
+        
+        return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+    
+    def _best_store_exact(self, target, threshold):
+        """모든 가게명과 비교 (유사도 상한 인덱스로 threshold 미만이 확실한 가게는 건너뜀)"""
+        if self.store_index is None:
+            self.store_index = JamoWordIndex(self.store_names, self.store_names_jamo)
+        return self._best_match(target, self.store_names, self.store_names_jamo, self.store_index, threshold)
+
+    def _best_store_in_shortlist(self, target, threshold, shortlist):
+        """
+        n-gram 역색인으로 추린 가게명 후보를 정확한 유사도로 비교해서 (가게명, 유사도, 확정 여부) 반환
+        확정 여부: q-gram 개수 조건으로 후보 밖의 가게가 결과를 바꿀 수 없음이 확인되었으면 True
+        """
+        if self.store_ngram_index is None:
+            self.store_ngram_index = JamoNgramIndex(self.store_names, self.store_names_jamo)
+        index = self.store_ngram_index
+        
+        target_jamo = self.decompose_hangul(target)
         best_match = None
         max_similarity = 0
+        best_key = (0, 0, float('-inf'))  # (유사도, 길이, -목록 순서): _best_match와 같은 동점 처리
         
-        for store_name in self.stores_dict.keys():
-            if abs(len(target) - len(store_name)) > len(target) / 2:
-                continue
-
-            similarity = self.calculate_jamo_similarity(target, store_name)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                best_match = store_name
-            elif similarity == max_similarity and len(store_name) > len(best_match or ""):
-                best_match = store_name
+        def compare(ids):
+            nonlocal best_match, max_similarity, best_key
+            for i in ids:
+                candidate = self.store_names[i]
+                similarity = self._jamo_similarity(target, target_jamo, candidate, self.store_names_jamo[i])
+                key = (similarity, len(candidate), -i)
+                if key > best_key:
+                    best_key = key
+                    best_match = candidate
+                    max_similarity = similarity
         
-        return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
+        # 1) 공유 n-gram이 많은 shortlist개로 기준 유사도를 먼저 구함
+        indices, shared = index.scored(target, target_jamo)
+        top = index.top_ranked(indices, shared, shortlist)
+        compare(top)
+        
+        # 2) 기준 유사도 이상이 될 수 있는 나머지 가게 (q-gram 개수 조건으로 걸러낼 수 없으면 미확정)
+        candidates = index.filter_candidates(target, target_jamo, max(threshold, max_similarity), indices, shared)
+        if candidates is None:
+            return best_match, max_similarity, False
+        compared = set(top)
+        compare(i for i in candidates.tolist() if i not in compared)
+        return best_match, max_similarity, True
 
     def find_best_item_match(self, target, store_name, threshold=0.4):
-        """특정 가게의 메뉴에서 가장 유사한 매치 찾기 (JSON 전용)"""
-        if not self.store_item_path or not self.stores_dict or store_name not in self.stores_dict:
+        """특정 가게의 메뉴에서 가장 유사한 매치 찾기 (JSON/카탈로그 전용)"""
+        store_items = self.stores.store_items(store_name)
+        if store_items is None:
             return None, 0
             
-        items_list = self.stores_dict[store_name].get("items", [])
-        best_match = None
-        max_similarity = 0
+        items_list, items_jamo = store_items
+        index = self.item_indexes.get(store_name)
+        if index is None:
+            index = self.item_indexes.put(store_name, JamoWordIndex(items_list, items_jamo))
         
-        for item in items_list:
-            if abs(len(target) - len(item)) > len(target) / 2:
-                continue
-            similarity = self.calculate_jamo_similarity(target, item)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                best_match = item
-            elif similarity == max_similarity and len(item) > len(best_match or ""):
-                best_match = item
+        best_match, max_similarity = self._best_match(target, items_list, items_jamo, index, threshold)
         
         return (best_match, max_similarity) if max_similarity >= threshold else (None, 0)
     
+    def iter_item_prefix_matches(self, words, store_name, threshold=0.4):
+        """
+        words[0..k]를 띄어쓰기로 이어 붙인 구문마다 find_best_item_match(구문, store_name) 결과 생성
+        앞 구문까지의 자모와 LCS 상태를 이어서 쓰므로 단어가 늘어도 메뉴 목록을 처음부터 다시 비교하지 않음
+        (필요한 만큼만 계산하므로 중간에 멈춰도 됨)
+        """
+        store_items = self.stores.store_items(store_name)
+        if store_items is None:
+            for _ in words:
+                yield None, 0
+            return
+        
+        items_list, items_jamo = store_items
+        matcher = self.item_prefix_matchers.get(store_name)
+        if matcher is None:
+            matcher = self.item_prefix_matchers.put(store_name, PrefixMatcher(items_list, items_jamo))
+        
+        words_jamo = (self.decompose_hangul(word) for word in words)
+        for i, similarity in matcher.iter_prefix_matches(words, words_jamo):
+            yield (items_list[i], similarity) if i >= 0 and similarity >= threshold else (None, 0)
+    
     def decompose_hangul(self, text):
+        return self._decompose_cached(text)
+    
+    def _decompose(self, text):
         result = []
         for char in text:
             if '가' <= char <= '힣':  # 한글 문자인지 확인
@@ -121,7 +341,10 @@ class TextPostProcessor:
     def calculate_jamo_similarity(self, word1, word2):
         jamo1 = self.decompose_hangul(word1)  # 첫 번째 단어 자모 분해
         jamo2 = self.decompose_hangul(word2)  # 두 번째 단어 자모 분해
-        
+        return self._jamo_similarity(word1, jamo1, word2, jamo2)
+    
+    def _jamo_similarity(self, word1, jamo1, word2, jamo2):
+        """자모 분해가 끝난 두 단어의 유사도 (사전 쪽 자모는 미리 계산된 값 사용)"""
         # 짧은 단어는 jaro 알고리즘, 긴 단어는 ratio 알고리즘 사용
         if len(word1) <= 2 or len(word2) <= 2:
             similarity = Levenshtein.jaro(jamo1, jamo2)
@@ -135,16 +358,41 @@ class TextPostProcessor:
         
         return max(0, min(1, similarity))  # 0~1 범위로 제한
     
-    def find_closest_word(self, word, threshold=0.70):
+    def find_closest_word(self, word, threshold=0.70, use_index=True):
+        # 이전 실행에서 계산한 교정 결과가 있으면 그대로 사용
+        cache = self.correction_cache if use_index else None
+        cached = cache.get_many([word], threshold) if cache else {}
+        if word in cached:
+            correction, max_similarity = cached[word]
+        else:
+            # 인덱스로 임계값을 넘을 수 있는 후보만 상한 순으로 비교 (use_index=False면 전체 순회)
+            if use_index:
+                best_match, max_similarity = self._best_match(
+                    word, self.dictionary, self.dictionary_jamo, self.word_index, threshold)
+            else:
+                best_match, max_similarity = self._find_closest_word_linear(word)
+            
+            # 임계값 이상이고 완전 일치가 아닌 경우에만 교정
+            correction = best_match if threshold <= max_similarity < 1 else None
+            if cache:
+                cache.put_many({word: (correction, max_similarity)}, threshold)
+        
+        if correction:
+            print(f"✅ 교정: {word} → {correction} (유사도: {max_similarity:.4f})")
+        return correction  # 적합한 단어를 찾지 못하면 None
+    
+    def _find_closest_word_linear(self, word):
+        """사전 전체 순회 (인덱스 검증/성능 비교용)"""
         best_match = None
         max_similarity = 0
+        word_jamo = self.decompose_hangul(word)
             
-        for candidate in self.dictionary:
+        for candidate, candidate_jamo in zip(self.dictionary, self.dictionary_jamo):
             # 길이 차이가 너무 크면 건너뛰기 (성능 최적화)
             if abs(len(word) - len(candidate)) > len(word) / 2:
                 continue
             
-            similarity = self.calculate_jamo_similarity(word, candidate)
+            similarity = self._jamo_similarity(word, word_jamo, candidate, candidate_jamo)
             
             # 더 높은 유사도이거나, 같은 유사도인데 더 긴 단어 선호
             if (similarity > max_similarity or 
@@ -152,81 +400,63 @@ class TextPostProcessor:
                 max_similarity = similarity
                 best_match = candidate
         
-        # 임계값 이상이고 완전 일치가 아닌 경우에만 교정
-        if max_similarity >= threshold and max_similarity < 1:
-            print(f"✅ 교정: {word} → {best_match} (유사도: {max_similarity:.4f})")
-            return best_match
-        return None  # 적합한 단어를 찾지 못함
+        return best_match, max_similarity
     
     def normalize_number(self, text):
         if not text:
             return text
         
-        # OCR 숫자 오류 패턴 보정
-        text = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', text)  # O → 0
-        text = re.sub(r'(\d+)O\b', r'\g<1>0', text)  # 끝자리 O → 0
-        text = re.sub(r'\bO(\d+)', r'0\g<1>', text)  # 첫자리 O → 0
-        text = re.sub(r'(\d*[,\.])O(\d*)', r'\g<1>0\g<2>', text)  # 콤마/점 뒤 O → 0
-        text = re.sub(r'(\d*)U(\d*)', r'\g<1>0\g<2>', text)  # U → 0
-        
-        # process_text2에서 추가된 패턴들
-        text = re.sub(r'(\d*)E(\d*)', r'\g<1>0\g<2>', text)  # E → 0
-        text = re.sub(r'(\d+)E\b', r'\g<1>0', text)  # 끝자리 E → 0
-        text = re.sub(r'\bE(\d+)', r'0\g<1>', text)  # 첫자리 E → 0
-        text = re.sub(r'(\d*[,\.])E(\d*)', r'\g<1>0\g<2>', text)  # 콤마/점 뒤 E → 0
-        text = re.sub(r'(\d*)C(\d*)', r'\g<1>0\g<2>', text)  # C → 0
-        text = re.sub(r'(\d+)C\b', r'\g<1>0', text)  # 끝자리 C → 0
-        text = re.sub(r'\bC(\d+)', r'0\g<1>', text)  # 첫자리 C → 0
-        text = re.sub(r'(\d*[,\.])C(\d*)', r'\g<1>0\g<2>', text)  # 콤마/점 뒤 C → 0
-        
-        text = re.sub(r'(\d*)\((\d*)', r'\1\2', text)  # 숫자 주변 괄호 제거
-        text = re.sub(r'(\d*)\)(\d*)', r'\1\2', text)
-        
-        text = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', text)  # 콤마 주변 공백 제거
-        text = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', text)  # 소수점 주변 공백 제거
-        
-        text = re.sub(r'(\d{1,3})\.(\d{3})(?!\d)', r'\1,\2', text)  # 천단위 점 → 콤마로 통일
-            
-        # 숫자 사이 공백 패턴 처리
-        def handle_number_spacing(match):
-            num1 = match.group(1)
-            num2 = match.group(2)
-            
-            if len(num1) < 3 and len(num2) == 3:  # 1~2자리 + 3자리: 콤마로 변환
-                return f"{num1},{num2}"
-            elif len(num1) == 3 and len(num2) == 3:
-                if num2 == "000":  # 3자리 + 000 패턴: 콤마 사용
-                    return f"{num1},{num2}"
-                else:
-                    return f"{num1} {num2}"  # 기존 공백 유지
-            else:
-                return f"{num1},{num2}"  # 그 외 패턴: 콤마로 변환
+        # OCR 숫자 오류 보정 (O/U/E/C → 0, 괄호 제거, 콤마/점/공백 정리: text_rules.json의 normalize 단계)
+        return self.rules["normalize"].apply(text)
+    
+    def correct_words(self, words, threshold=0.70):
+        """
+        단어 목록을 한 번에 교정해서 {원래 단어: 교정 단어} 반환 (교정되는 단어만 포함)
+        - 같은 단어는 한 번만 계산 (영수증마다 반복되는 "승인번호", "할부기간" 등)
+        - 고유 단어 × 사전 유사도 행렬을 한 번에 계산 (batch_matcher, 사전 쪽 준비는 처음 한 번만)
+        - 교정 캐시에 있는 단어는 계산 생략, 새로 계산한 결과는 캐시에 저장
+        - 단어마다 find_closest_word를 호출한 것과 결과 동일
+        """
+        if not self.dictionary:
+            return {}
         
-        text = re.sub(r'(\d{1,3})\s+(\d{3})(?!\d)', handle_number_spacing, text)
+        unique_words = list(dict.fromkeys(word for word in words if self._is_correctable(word)))
+        results = self.correction_cache.get_many(unique_words, threshold) if self.correction_cache else {}
         
-        return text
+        missing = [word for word in unique_words if word not in results]
+        matches = self.batch_matcher.best_matches(missing, [self.decompose_hangul(word) for word in missing])
+        computed = {}
+        for word, (index, similarity) in zip(missing, matches):
+            # 임계값 이상이고 완전 일치가 아닌 경우에만 교정
+            correction = self.dictionary[index] if index >= 0 and threshold <= similarity < 1 else None
+            computed[word] = (correction, similarity)
+        if self.correction_cache:
+            self.correction_cache.put_many(computed, threshold)
+        results.update(computed)
+        
+        corrections = {}
+        for word in unique_words:
+            correction, similarity = results[word]
+            if correction:
+                corrections[word] = correction
+                print(f"✅ 교정: {word} → {correction} (유사도: {similarity:.4f})")
+        return corrections
+    
+    def _is_correctable(self, word):
+        """숫자가 없고, 한글이 있고, 2글자 이상인 단어만 교정 대상"""
+        return not re.search(r'\d', word) and re.search(r'[가-힣]', word) and len(word) > 1
     
     def clean_text(self, text):
         if not text:
             return text
         
-        text = re.sub(r'\s+', ' ', text).strip()  # 중복 공백 제거
-        
-        text = re.sub(r'(\d+)l(\d+)', r'\g<1>1\g<2>', text)  # l → 1 변환
-        text = re.sub(r'(\d+)I(\d+)', r'\g<1>1\g<2>', text)  # I → 1 변환
-        
-        # 시간 표기 정리
-        text = re.sub(r';', ':', text)  # 세미콜론 → 콜론
-        text = re.sub(r'([^\s]):([^\s])', r'\1 : \2', text)  # 콜론 앞뒤 공백 추가
-        text = re.sub(r'([^\s]):', r'\1 :', text)  # 콜론 앞 공백 추가
-        text = re.sub(r':([^\s])', r': \1', text)  # 콜론 뒤 공백 추가
+        text = self._clean_symbols(text)
         
         # 한글 단어 교정 (텍스트 사전이 있는 경우에만)
         if hasattr(self, 'dictionary') and self.dictionary:
             words = text.split()
             for i, word in enumerate(words):
-                # 숫자가 없고, 한글이 있고, 2글자 이상인 단어만 교정
-                if not re.search(r'\d', word) and re.search(r'[가-힣]', word) and len(word) > 1:
+                if self._is_correctable(word):
                     closest_word = self.find_closest_word(word)
                     if closest_word:  # 사전에서 유사한 단어를 찾은 경우
                         words[i] = closest_word
@@ -234,49 +464,124 @@ class TextPostProcessor:
         
         return text
     
+    def _clean_symbols(self, text):
+        """단어 교정 전 정리 (공백, 숫자 사이 l/I, 시간 표기: text_rules.json의 clean 단계)"""
+        return self.rules["clean"].apply(text)
+    
     def merge_number_line(self, lines):
         if len(lines) <= 1:
             return lines
         
-        number_pattern = re.compile(r'^[\d,.\s OlI]+$')  # 숫자와 특수문자로만 구성된 패턴
-        i = 1  # 두 번째 줄부터 검사
-        
-        while i < len(lines):
-            current_line = lines[i].strip()
+        lines[:] = self._merge_number_stream(lines)  # 호출 쪽 리스트도 병합 결과로 갱신
+        return lines
+    
+    def _merge_number_stream(self, lines):
+        """
+        숫자로만 구성된 줄을 바로 앞 줄에 병합하면서 줄을 하나씩 내보내는 제너레이터
+        - 다음 줄이 숫자 줄인지 볼 때까지 직전 줄 하나만 보관 (한 줄 lookahead)
+        - 연속된 숫자 줄은 모두 같은 앞 줄에 병합, 앞 줄이 비어 있으면 병합하지 않음
+        """
+        previous = None
+        for line in lines:
+            current_line = line.strip()
             
-            # 숫자로만 구성된 줄인지 확인
-            if current_line and number_pattern.match(current_line):
-                prev_line = lines[i-1].strip()
+            # 숫자로만 구성된 줄이고 이전 줄이 비어있지 않으면 병합
+            if previous is not None and current_line and NUMBER_LINE_PATTERN.match(current_line) and previous.strip():
+                # 현재 줄 숫자 정규화
+                processed_line = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', current_line)
+                processed_line = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', processed_line)
+                processed_line = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', processed_line)
                 
-                if prev_line:  # 이전 줄이 비어있지 않으면 병합
-                    # 현재 줄 숫자 정규화
-                    processed_line = re.sub(r'(\d*)O(\d*)', r'\g<1>0\g<2>', current_line)
-                    processed_line = re.sub(r'(\d+)\s*,\s*(\d+)', r'\1,\2', processed_line)
-                    processed_line = re.sub(r'(\d+)\s*\.\s*(\d+)', r'\1.\2', processed_line)
-                    
-                    lines[i-1] = f"{lines[i-1].rstrip()} {processed_line}"  # 이전 줄에 병합
-                    lines.pop(i)  # 현재 줄 제거
-                else:
-                    i += 1  # 이전 줄이 비어있으면 다음으로
+                previous = f"{previous.rstrip()} {processed_line}"  # 이전 줄에 병합
             else:
-                i += 1  # 숫자 줄이 아니면 다음으로
+                if previous is not None:
+                    yield previous  # 더 이상 병합될 줄이 없으므로 확정
+                previous = line
         
-        return lines
-
+        if previous is not None:
+            yield previous
+    
     def process_lines(self, lines):
         """
         줄 리스트를 받아 후처리된 줄 리스트로 반환
         """
-        processed_lines = [self.process_line(line) for line in lines]
-        processed_lines = self.merge_number_line(processed_lines)
+        processed_lines = self.process_line_batches([lines])[0]
         print("✅ 텍스트 후처리 완료")
         return processed_lines
     
+    def process_line_batches(self, batches):
+        """
+        여러 문서의 줄 리스트를 한 번에 후처리 (문서마다 process_line + merge_number_line 결과와 동일)
+        - 모든 줄을 먼저 정리한 뒤, 등장한 단어를 모아 correct_words로 한 번에 교정
+        """
+        return [self.merge_number_line(lines) for lines in self._correct_batches(batches)]
+    
+    def _correct_batches(self, batches):
+        """정리 → 단어 일괄 교정 → 숫자 보정 (숫자 줄 병합 전 단계)"""
+        cleaned_batches = [[self._clean_symbols(line) if line.strip() else line for line in lines]
+                           for lines in batches]
+        corrections = self.correct_words(
+            word for lines in cleaned_batches for line in lines for word in line.split())
+        
+        processed_batches = []
+        for lines in cleaned_batches:
+            processed_lines = []
+            for line in lines:
+                if line.strip():  # 빈 줄은 그대로 유지
+                    line = ' '.join(corrections.get(word, word) for word in line.split())
+                    line = self.normalize_number(line)  # 숫자 형식 정규화
+                processed_lines.append(line)
+            processed_batches.append(processed_lines)
+        return processed_batches
+    
+    def process_stream(self, lines, batch_lines=STREAM_BATCH_LINES):
+        """
+        줄 단위 스트리밍 후처리 (제너레이터, 처리가 끝난 줄부터 차례로 반환)
+        - 입력 줄을 batch_lines개씩 모아 정리/단어 일괄 교정/숫자 보정
+        - 숫자 줄 병합은 한 줄 lookahead로 처리하므로 묶음 경계와 관계없이 process_text와 결과 동일
+        - 전체 입력을 리스트로 만들지 않아서 아주 큰 입력(하루치 POS 출력 등)도 일정한 메모리로 처리
+        입력 줄 끝의 개행은 제거되고, 반환되는 줄에는 개행이 없음
+        """
+        def corrected_lines():
+            chunk = []
+            for line in lines:
+                chunk.append(line.rstrip('\n'))
+                if len(chunk) >= batch_lines:
+                    yield from self._correct_batches([chunk])[0]
+                    chunk = []
+            if chunk:
+                yield from self._correct_batches([chunk])[0]
+        
+        return self._merge_number_stream(corrected_lines())
+    
+    def process_file_stream(self, input_path, output_path):
+        """큰 텍스트 파일을 스트리밍으로 후처리해서 저장 (파일 전체를 메모리에 올리지 않음)"""
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        line_count = 0
+        with open(input_path, 'r', encoding='utf-8') as in_file, \
+                open(output_path, 'w', encoding='utf-8') as out_file:
+            for line in self.process_stream(in_file):
+                out_file.write(f"{line}\n")
+                line_count += 1
+        print(f"처리 완료: {output_path} ({line_count}줄)")
+        return line_count
+    
+    def process_record(self, record, min_confidence=0.0):
+        """
+        OCR 레코드를 받아 후처리된 줄("lines")을 추가한 레코드로 반환
+        min_confidence 미만 토큰은 후처리 전에 제외
+        """
+        processed = dict(record)
+        processed["lines"] = self.process_lines(record_lines(record, min_confidence))
+        return processed
+    
     def process_text(self, text):
-        lines = text.split('\n')  # 줄 단위로 분리
-        processed_lines = [self.process_line(line) for line in lines]  # 각 줄 처리
-        processed_lines = self.merge_number_line(processed_lines)  # 숫자 줄 병합
-        return '\n'.join(processed_lines)  # 처리된 줄 결합
+        return self.process_texts([text])[0]
+    
+    def process_texts(self, texts):
+        """여러 텍스트를 한 번에 후처리 (고유 단어 일괄 교정)"""
+        batches = [text.split('\n') for text in texts]  # 줄 단위로 분리
+        return ['\n'.join(lines) for lines in self.process_line_batches(batches)]  # 처리된 줄 결합
     
     def process_line(self, line):
         if not line.strip():  # 빈 줄 처리
@@ -287,37 +592,65 @@ class TextPostProcessor:
         
         return line
     
-    def process_file(self, input_path, output_path):
+    def _read_input(self, input_path, min_confidence=0.0):
+        """입력 파일 읽기 (레코드 파일은 텍스트 뷰로 변환해서 동일하게 처리)"""
+        if input_path.endswith('.jsonl'):
+            return ''.join(f"{line}\n" for line in load_lines(input_path, min_confidence))
+        with open(input_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        return re.sub(r'^// filepath:.*\n', '', content)  # 주석 제거
+    
+    def _write_output(self, output_path, processed_text):
+        # 결과 저장 디렉토리 생성
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as out_file:
+            out_file.write(processed_text)
+    
+    def process_file(self, input_path, output_path, min_confidence=0.0):
         try:
-            # 파일 읽기
-            with open(input_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                content = re.sub(r'^// filepath:.*\n', '', content)  # 주석 제거
-                
-                print(f"처리 시작: {input_path}")
-                processed_text = self.process_text(content)  # 텍스트 처리
-                
-                # 결과 저장 디렉토리 생성
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as out_file:
-                    out_file.write(processed_text)
-                
-                print(f"처리 완료: {output_path}")
-                return True
+            content = self._read_input(input_path, min_confidence)
+            
+            print(f"처리 시작: {input_path}")
+            processed_text = self.process_text(content)  # 텍스트 처리 (파일 안 고유 단어 일괄 교정)
+            
+            self._write_output(output_path, processed_text)
+            print(f"처리 완료: {output_path}")
+            return True
         except Exception as e:
             print(f"처리 오류: {e}")
             return False
     
-    def process_directory(self, input_dir, output_dir):
-        os.makedirs(output_dir, exist_ok=True)  # 출력 디렉토리 생성
-        print(f"{input_dir} 폴더에서 텍스트 로드중...")
+    def process_files(self, file_pairs, min_confidence=0.0):
+        """
+        (입력 경로, 출력 경로) 목록을 한 번에 후처리 (파일 전체의 고유 단어를 한 번만 교정)
+        성공한 파일 수 반환
+        """
+        contents = []
+        for input_path, output_path in file_pairs:
+            try:
+                contents.append((output_path, self._read_input(input_path, min_confidence)))
+            except Exception as e:
+                print(f"처리 오류: {input_path}: {e}")
         
         processed_count = 0
-        total_files = 0
+        processed_texts = self.process_texts([content for _, content in contents])
+        for (output_path, _), processed_text in zip(contents, processed_texts):
+            try:
+                self._write_output(output_path, processed_text)
+                print(f"처리 완료: {output_path}")
+                processed_count += 1  # 성공 카운트 증가
+            except Exception as e:
+                print(f"처리 오류: {e}")
+        return processed_count
+    
+    def process_directory(self, input_dir, output_dir, min_confidence=0.0, batch_size=DIRECTORY_BATCH_SIZE,
+                          workers=1):
+        os.makedirs(output_dir, exist_ok=True)  # 출력 디렉토리 생성
+        print(f"{input_dir} 폴더에서 텍스트 로드중...")
         
-        for filename in os.listdir(input_dir):
-            if filename.endswith('.txt'):  # txt 파일만 처리
-                total_files += 1
+        file_pairs = []
+        for filename in sorted(os.listdir(input_dir)):
+            if filename.endswith(('.txt', '.jsonl')):  # txt 또는 OCR 레코드 파일만 처리
                 base_filename = os.path.splitext(filename)[0]
                 
                 # _raw 접미사 처리
@@ -327,26 +660,142 @@ class TextPostProcessor:
                     new_base = base_filename
                 
                 new_filename = f"{new_base}_processed.txt"  # 처리된 파일명
-                
-                input_path = os.path.join(input_dir, filename)
-                output_path = os.path.join(output_dir, new_filename)
-                
-                print(f"\n처리 중: {filename} → {new_filename}")
-                if self.process_file(input_path, output_path):
-                    processed_count += 1  # 성공 카운트 증가
+                print(f"처리 대상: {filename} → {new_filename}")
+                file_pairs.append((os.path.join(input_dir, filename), os.path.join(output_dir, new_filename)))
+        
+        # batch_size개 파일씩 묶어서 고유 단어를 한 번에 교정
+        if workers > 1 and len(file_pairs) > 1:
+            # 워커마다 여러 묶음이 돌아가도록 묶음 크기 축소
+            batch_size = max(1, min(batch_size, -(-len(file_pairs) // (workers * TASKS_PER_WORKER))))
+            batches = [file_pairs[start:start + batch_size] for start in range(0, len(file_pairs), batch_size)]
+            processed_count = self._process_batches_parallel(batches, min_confidence, workers)
+        else:
+            processed_count = 0
+            for start in range(0, len(file_pairs), batch_size):
+                processed_count += self.process_files(file_pairs[start:start + batch_size], min_confidence)
+        
+        failed_count = len(file_pairs) - processed_count
+        print(f"처리 완료: {processed_count}/{len(file_pairs)} 파일 처리됨, 실패 {failed_count}개")
+        if self.correction_cache and workers <= 1:
+            cache = self.correction_cache
+            print(f"교정 캐시: 단어 {cache.hits + cache.misses}개 중 {cache.hits}개 적중")
+        return processed_count
+    
+    def _process_batches_parallel(self, batches, min_confidence, workers):
+        """
+        파일 묶음들을 프로세스 풀로 병렬 후처리하고 성공한 파일 수 반환
+        - fork 가능한 환경: 이미 만든 사전/자모/인덱스를 워커가 그대로 물려받음 (읽기 전용)
+        - 그 외(spawn): 워커마다 사전을 한 번만 로드
+        """
+        global _worker_processor
+        print(f"병렬 처리: 워커 {workers}개, 작업 묶음 {len(batches)}개")
         
-        print(f"처리 완료: {processed_count}/{total_files} 파일 처리됨")
+        use_fork = "fork" in multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if use_fork else None)
+        if use_fork:
+            _worker_processor = self  # fork 시점에 워커로 복사됨
+        
+        processed_count = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                     initargs=(self.dict_path, self.rules_path,
+                                               self.correction_cache_path)) as executor:
+                futures = {executor.submit(_process_files_in_worker, batch, min_confidence): batch
+                           for batch in batches}
+                for future in as_completed(futures):
+                    try:
+                        processed_count += future.result()
+                    except Exception as e:
+                        print(f"처리 오류: 파일 {len(futures[future])}개 묶음 실패: {e}")
+        finally:
+            if use_fork:
+                _worker_processor = None
         return processed_count
 
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def get_processor(dict_path="dictionary.txt", **options):
+    """
+    사전별 TextPostProcessor를 프로세스에서 한 번만 만들어 공유 (레지스트리)
+    - 사전 파일의 수정 시각/크기가 바뀌면 내용 해시를 비교해서 실제로 바뀐 경우에만 다시 로드
+    - 오래 실행되는 서비스도 재시작 없이 사전 수정 사항 반영
+    options는 TextPostProcessor 생성 인자 (옵션이 다르면 별도 인스턴스)
+    """
+    key = (os.path.abspath(dict_path), tuple(sorted(options.items())))
+    signature = _file_signature(dict_path)
+    
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry is not None:
+            processor, loaded_signature, loaded_digest = entry
+            if signature == loaded_signature:
+                return processor  # 파일 그대로 (stat 한 번으로 확인)
+            digest = _file_digest(dict_path)
+            if digest == loaded_digest:
+                entry[1] = signature  # 수정 시각만 바뀜 (내용 동일)
+                return processor
+            print(f"사전 변경 감지, 다시 로드: {dict_path}")
+        else:
+            digest = _file_digest(dict_path)
+        
+        processor = TextPostProcessor(dict_path=dict_path, **options)
+        _registry[key] = [processor, signature, digest]
+        return processor
+
+def _init_worker(dict_path, rules_path, correction_cache_path):
+    """병렬 처리 워커 초기화 - fork로 물려받은 후처리기가 없을 때만 사전 로드"""
+    global _worker_processor
+    if _worker_processor is None or _worker_processor.dict_path != dict_path:
+        _worker_processor = TextPostProcessor(dict_path=dict_path, rules_path=rules_path,
+                                              correction_cache_path=correction_cache_path)
+
+def _process_files_in_worker(file_pairs, min_confidence):
+    # 워커에서는 결과 대신 성공 개수만 반환 (프로세스 간 전송 최소화)
+    return _worker_processor.process_files(file_pairs, min_confidence)
+
 # 메인 실행
 if __name__ == "__main__":
-    print("텍스트 후처리기 초기화...")
+    import argparse
+    parser = argparse.ArgumentParser(description="OCR 텍스트 후처리")
+    parser.add_argument("--records", action="store_true",
+                        help="ocr_raw_txt 대신 OCR 구조화 레코드(ocr_records/*.jsonl) 사용")
+    parser.add_argument("--min-confidence", type=float, default=0.0,
+                        help="--records 사용 시 이 신뢰도 미만 토큰 제외")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="병렬 처리 프로세스 수 (기본 1: 순차 처리)")
+    parser.add_argument("--stream", nargs=2, metavar=("INPUT", "OUTPUT"),
+                        help="큰 텍스트 파일 하나를 줄 단위 스트리밍으로 후처리")
+    parser.add_argument("--no-correction-cache", action="store_true",
+                        help="단어 교정 결과 캐시 사용 안 함 (매번 유사도 계산)")
+    args = parser.parse_args()
     
-    processor = TextPostProcessor(dict_path="dictionary.txt")  # 후처리기 초기화
+    print("텍스트 후처리기 초기화...")
     
-    OUTPUT_DIR = "output"
-    input_dir = os.path.join(OUTPUT_DIR, "ocr_raw_txt")  # 원본 텍스트 폴더
-    output_dir = os.path.join(OUTPUT_DIR, "ocr_processed_txt")  # 처리된 텍스트 폴더
+    cache_path = None if args.no_correction_cache else DEFAULT_CORRECTION_CACHE_PATH
+    processor = TextPostProcessor(dict_path="dictionary.txt", correction_cache_path=cache_path)  # 후처리기 초기화
     
-    print(f"\n{input_dir} 폴더 처리 시작...")
-    processor.process_directory(input_dir, output_dir)  # 디렉토리 내 모든 파일 처리
\ No newline at end of file
+    if args.stream:
+        processor.process_file_stream(*args.stream)  # 파일 하나를 스트리밍으로 처리
+    else:
+        OUTPUT_DIR = "output"
+        if args.records:
+            input_dir = os.path.join(OUTPUT_DIR, "ocr_records")  # OCR 레코드 폴더
+        else:
+            input_dir = os.path.join(OUTPUT_DIR, "ocr_raw_txt")  # 원본 텍스트 폴더
+        output_dir = os.path.join(OUTPUT_DIR, "ocr_processed_txt")  # 처리된 텍스트 폴더
+        
+        print(f"\n{input_dir} 폴더 처리 시작...")
+        processor.process_directory(input_dir, output_dir, args.min_confidence,
+                                    workers=args.workers)  # 디렉토리 내 모든 파일 처리
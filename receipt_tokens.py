@@ -0,0 +1,88 @@
+import re
+from ocr_record import load_lines
+
+"""
+영수증 줄 토큰화 모듈
+- 줄마다 한 번만 띄어쓰기로 나누고, 단어마다 종류(text/number/price)와 숫자 값을 미리 계산
+- extract_item(패턴 기반)과 extract_item2(사전 기반)가 같은 토큰화 결과를 사용
+  (단어마다 정규식/int 변환 예외를 반복하지 않음, 두 방식을 같은 파싱 결과로 실행 가능)
+"""
+
+TEXT, NUMBER, PRICE = "text", "number", "price"
+
+PRICE_PATTERN = re.compile(r'[\d,]+')  # 숫자와 콤마만 포함 (extract_item의 금액/단가 형식)
+INTEGER_PATTERN = re.compile(r'[+-]?\d+(?:_\d+)*')  # int()가 받아들이는 정수 형식
+NUMBER_TRANSLATION = str.maketrans({'O': '0', ',': None, '.': None})  # O → 0 (OCR 오류 보정), 콤마/점 제거
+
+
+def normalize_number(text):
+    """숫자 단어 정규화: O → 0, 콤마/점/공백 제거"""
+    if not text:
+        return text
+    return ''.join(text.translate(NUMBER_TRANSLATION).split())
+
+
+def parse_number(text):
+    """정규화 후 정수로 읽을 수 있으면 그 값, 아니면 None"""
+    normalized = normalize_number(text)
+    if normalized and INTEGER_PATTERN.fullmatch(normalized):
+        return int(normalized)
+    return None
+
+
+class Token:
+    """
+    줄의 단어 하나
+    kind: PRICE(숫자와 콤마만), NUMBER(그 외 정수로 읽히는 단어: "1.000", "3O0" 등), TEXT(나머지)
+    value: 정수 값 (숫자가 없는 PRICE 단어(",")와 TEXT는 None)
+    """
+    __slots__ = ("text", "kind", "value")
+
+    def __init__(self, text):
+        self.text = text
+        self.value = parse_number(text)
+        if PRICE_PATTERN.fullmatch(text):
+            self.kind = PRICE
+        elif self.value is not None:
+            self.kind = NUMBER
+        else:
+            self.kind = TEXT
+
+    def __repr__(self):
+        return f"Token({self.text!r}, {self.kind}, {self.value})"
+
+
+class TokenLine:
+    """빈 줄이 아닌 줄 하나 (index: 원본 줄 번호, text: 앞뒤 공백을 제거한 줄, tokens: 단어 토큰 목록)"""
+    __slots__ = ("index", "text", "tokens")
+
+    def __init__(self, index, text):
+        self.index = index
+        self.text = text
+        self.tokens = [Token(word) for word in text.split()]
+
+    @property
+    def words(self):
+        return [token.text for token in self.tokens]
+
+    def numbers(self, start=0):
+        """start번째 단어부터 정수로 읽히는 단어들의 값"""
+        return [token.value for token in self.tokens[start:] if token.value is not None]
+
+    def __repr__(self):
+        return f"TokenLine({self.index}, {self.text!r})"
+
+
+def tokenize_lines(lines):
+    """텍스트 줄 목록 → 빈 줄을 제외한 TokenLine 목록"""
+    tokenized = []
+    for index, line in enumerate(lines):
+        text = line.strip()
+        if text:
+            tokenized.append(TokenLine(index, text))
+    return tokenized
+
+
+def load_token_lines(filepath):
+    """txt 또는 OCR 레코드(.jsonl) 파일을 읽어서 토큰화"""
+    return tokenize_lines(load_lines(filepath))
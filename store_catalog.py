@@ -0,0 +1,171 @@
+import os
+import json
+import sqlite3
+import hashlib
+import numpy as np
+from fuzzy_index import JamoNgramIndex, jamo_ngrams
+from lru import LRUCache
+
+"""
+가게/메뉴 카탈로그 모듈 (SQLite)
+- 전국 단위 가게 목록처럼 JSON 사전 전체를 메모리에 올리기 어려울 때 사용
+- 가게명, 자모 분해 결과, 자모 3-gram 역색인을 SQLite 파일에 미리 저장 (시작 시 파싱/자모 분해 없음)
+- 가게명 후보 추리기는 SQLite에 저장된 n-gram별 가게 id 목록으로 처리 (JamoNgramIndex와 같은 결과)
+- 메뉴 목록은 매칭된 가게만 필요할 때 읽고, 최근 사용한 가게 몇 개만 메모리에 보관 (LRU)
+- 기존 dictionary_store_item.json 형식에서 가져오기 지원
+"""
+
+CATALOG_EXTENSIONS = ('.sqlite3', '.db')
+CATALOG_VERSION = 1  # 저장 형식이나 자모 분해/n-gram 규칙이 바뀌면 올려서 다시 가져오도록 함
+DEFAULT_HOT_STORES = 64  # 메뉴 목록을 메모리에 보관할 최근 가게 수
+POSTING_DTYPE = '<i4'  # n-gram별 가게 id 목록 저장 형식
+
+
+def catalog_path_for(json_path):
+    """JSON 사전에 대응하는 기본 카탈로그 경로 (같은 위치, 확장자만 .sqlite3)"""
+    return os.path.splitext(json_path)[0] + CATALOG_EXTENSIONS[0]
+
+
+def import_json(json_path, catalog_path, decompose):
+    """
+    dictionary_store_item.json 형식의 사전을 카탈로그 파일로 변환 후 경로 반환
+    decompose: 단어 → 자모 문자열 함수 (TextPostProcessor._decompose)
+    """
+    with open(json_path, 'rb') as f:
+        source = f.read()
+    stores_dict = json.loads(source.decode('utf-8')).get("stores", {})
+
+    os.makedirs(os.path.dirname(catalog_path) or '.', exist_ok=True)
+    tmp_path = f"{catalog_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            connection.executescript("""
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                CREATE TABLE stores (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    name_jamo TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    info TEXT NOT NULL
+                );
+                CREATE TABLE store_ngrams (
+                    gram TEXT PRIMARY KEY,
+                    store_ids BLOB NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE items (
+                    store_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    name_jamo TEXT NOT NULL,
+                    PRIMARY KEY (store_id, position)
+                ) WITHOUT ROWID;
+            """)
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("version", str(CATALOG_VERSION)),
+                ("source", os.path.abspath(json_path)),
+                ("source_sha256", hashlib.sha256(source).hexdigest()),
+            ])
+            # 가게 id = JSON 순서 (가게명 매칭의 동점 처리에서 목록 순서로 사용)
+            postings = {}
+            for store_id, (name, info) in enumerate(stores_dict.items()):
+                name_jamo = decompose(name)
+                extra = {key: value for key, value in info.items() if key != "items"}
+                connection.execute("INSERT INTO stores VALUES (?, ?, ?, ?, ?)",
+                                   (store_id, name, name_jamo, len(name), json.dumps(extra, ensure_ascii=False)))
+                for gram in jamo_ngrams(name_jamo):
+                    postings.setdefault(gram, []).append(store_id)
+                connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?)",
+                                       [(store_id, position, item, decompose(item))
+                                        for position, item in enumerate(info.get("items", []))])
+            connection.executemany("INSERT INTO store_ngrams VALUES (?, ?)",
+                                   [(gram, np.array(ids, dtype=POSTING_DTYPE).tobytes())
+                                    for gram, ids in postings.items()])
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    os.replace(tmp_path, catalog_path)  # 다른 프로세스가 읽는 중이어도 깨지지 않도록 원자적 교체
+    print(f"{len(stores_dict)}개 가게 카탈로그 생성: {json_path} → {catalog_path}")
+    return catalog_path
+
+
+class StoreCatalog:
+    """읽기 전용 가게/메뉴 카탈로그 (프로세스마다 별도 연결)"""
+
+    def __init__(self, catalog_path, hot_stores=DEFAULT_HOT_STORES):
+        self.catalog_path = catalog_path
+        self._connection = None
+        self._pid = None
+        self._items = LRUCache(hot_stores)  # 가게명 → (메뉴 목록, 메뉴 자모 목록) 또는 None
+        meta = dict(self._connect().execute("SELECT key, value FROM meta"))
+        if int(meta.get("version", 0)) != CATALOG_VERSION:
+            raise ValueError(f"카탈로그 버전이 다름 (다시 가져오기 필요): {catalog_path}")
+        self.source_sha256 = meta.get("source_sha256")
+
+    def _connect(self):
+        """프로세스마다 별도 연결 사용 (fork로 물려받은 연결은 공유하면 안 됨)"""
+        if self._connection is None or self._pid != os.getpid():
+            if not os.path.exists(self.catalog_path):
+                raise FileNotFoundError(self.catalog_path)
+            uri = f"file:{os.path.abspath(self.catalog_path)}?mode=ro"
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def __len__(self):
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM stores").fetchone()
+        return count
+
+    def store_names(self):
+        """(가게명 목록, 가게명 자모 목록) 반환 (목록 순서 = 가게 id)"""
+        rows = self._connect().execute("SELECT name, name_jamo FROM stores ORDER BY id").fetchall()
+        return [name for name, _ in rows], [name_jamo for _, name_jamo in rows]
+
+    def store_info(self, store_name):
+        """가게 정보 dict (JSON 사전의 가게 항목과 같은 형식, 메뉴 포함) 또는 None"""
+        row = self._connect().execute("SELECT info FROM stores WHERE name = ?", (store_name,)).fetchone()
+        if row is None:
+            return None
+        info = json.loads(row[0])
+        info["items"] = self.store_items(store_name)[0]
+        return info
+
+    def ngram_index(self):
+        """가게명 n-gram 역색인 (n-gram별 가게 id 목록은 조회할 때마다 SQLite에서 읽음)"""
+        rows = self._connect().execute("SELECT length, LENGTH(name_jamo) FROM stores ORDER BY id").fetchall()
+        return JamoNgramIndex.from_postings(np.array([length for length, _ in rows], dtype=np.int64),
+                                            np.array([jamo_length for _, jamo_length in rows], dtype=np.int64), self)
+
+    def get(self, gram):
+        """n-gram이 들어 있는 가게 id 배열 또는 None (JamoNgramIndex의 postings 조회 객체)"""
+        row = self._connect().execute("SELECT store_ids FROM store_ngrams WHERE gram = ?", (gram,)).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype=POSTING_DTYPE)
+
+    def store_items(self, store_name):
+        """가게의 (메뉴 목록, 메뉴 자모 목록) 반환, 없는 가게면 None (최근 가게는 메모리에서 바로 반환)"""
+        if store_name in self._items:
+            return self._items.get(store_name)
+        connection = self._connect()
+        row = connection.execute("SELECT id FROM stores WHERE name = ?", (store_name,)).fetchone()
+        if row is None:
+            return self._items.put(store_name, None)
+        rows = connection.execute(
+            "SELECT name, name_jamo FROM items WHERE store_id = ? ORDER BY position", row).fetchall()
+        return self._items.put(store_name, ([name for name, _ in rows], [name_jamo for _, name_jamo in rows]))
+
+
+# 가져오기 실행 (JSON 사전 → 카탈로그)
+if __name__ == "__main__":
+    import argparse
+    from process_text import TextPostProcessor
+
+    parser = argparse.ArgumentParser(description="가게/메뉴 JSON 사전을 SQLite 카탈로그로 가져오기")
+    parser.add_argument("source", nargs="?", default="dictionary_store_item.json", help="JSON 사전 파일")
+    parser.add_argument("-o", "--output", help="카탈로그 파일 (기본: JSON과 같은 위치의 .sqlite3)")
+    args = parser.parse_args()
+
+    # 자모 분해 규칙은 후처리기와 같아야 하므로 후처리기의 분해 함수 사용
+    processor = TextPostProcessor(dict_path=args.source, use_artifact=False, correction_cache_path=None)
+    import_json(args.source, args.output or catalog_path_for(args.source), processor._decompose)
@@ -0,0 +1,126 @@
+import os
+import re
+import json
+
+"""
+텍스트 보정 규칙 엔진
+- OCR 오인식 보정 규칙을 선언형 표(text_rules.json)로 관리
+- 단계(clean/normalize)마다 문자 치환표 1개 + 정규식 규칙들을 하나의 정규식(대안 |)으로 컴파일
+- 한 번의 스캔에서 각 위치마다 표에 적힌 순서대로 규칙을 시도하고 처음 맞는 규칙 적용
+- 여러 규칙이 서로의 결과에 이어서 적용되어야 하는 경우("sequence")는 맞은 구간 안에서만 순서대로 적용
+- 새 OCR 오인식 패턴은 코드 수정 없이 표에 규칙만 추가
+"""
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "text_rules.json")
+GROUP_REFERENCE = re.compile(r'\\g<(\d+)>|\\(\d+)')
+
+
+def number_spacing(num1, num2):
+    """숫자 사이 공백 처리: 1~2자리 + 3자리, 3자리 + 000은 콤마, 그 외 3자리 + 3자리는 공백 유지"""
+    if len(num1) < 3 and len(num2) == 3:  # 1~2자리 + 3자리: 콤마로 변환
+        return f"{num1},{num2}"
+    elif len(num1) == 3 and len(num2) == 3:
+        if num2 == "000":  # 3자리 + 000 패턴: 콤마 사용
+            return f"{num1},{num2}"
+        else:
+            return f"{num1} {num2}"  # 기존 공백 유지
+    else:
+        return f"{num1},{num2}"  # 그 외 패턴: 콤마로 변환
+
+
+# 규칙 표의 "function"에서 이름으로 참조하는 치환 함수 (인자는 규칙 패턴의 그룹들)
+REPLACE_FUNCTIONS = {
+    "number_spacing": number_spacing,
+}
+
+
+class RuleStage:
+    """
+    한 단계의 규칙 묶음을 컴파일한 결과
+    chars: 문자 단위 치환표 ({"O": "0", "(": ""} 등, str.translate로 적용)
+    rules: [{"pattern": 정규식, "replace": 치환 문자열(\\1, \\g<1> 참조 가능)},
+            {"pattern": 정규식, "function": REPLACE_FUNCTIONS 이름} 또는
+            {"pattern": 구간 정규식, "sequence": [규칙, ...]}] (앞에 있는 규칙이 우선)
+    """
+
+    def __init__(self, chars=None, rules=()):
+        self.chars = str.maketrans(chars) if chars else None
+        self.handlers = {}  # 규칙 전체를 감싼 그룹 번호 → (종류, 치환 부품 목록 또는 함수, 규칙 내부 그룹 번호)
+
+        alternatives = []
+        group = 0
+        for rule in rules:
+            compiled = re.compile(rule["pattern"])
+            if compiled.groupindex:
+                raise ValueError(f"이름 있는 그룹은 사용할 수 없음 (번호 그룹 사용): {rule['pattern']}")
+            wrapper = group + 1  # 규칙을 감싸는 그룹 번호, 규칙 내부 그룹은 그 뒤 번호
+            groups = range(wrapper + 1, wrapper + 1 + compiled.groups)
+
+            if "sequence" in rule:
+                self.handlers[wrapper] = ("sequence", self._compile_sequence(rule["sequence"]), groups)
+            elif "function" in rule:
+                self.handlers[wrapper] = ("function", REPLACE_FUNCTIONS[rule["function"]], groups)
+            else:
+                template = self._compile_template(rule.get("replace", ""), wrapper, compiled.groups)
+                self.handlers[wrapper] = ("template", template, groups)
+
+            alternatives.append(f"({rule['pattern']})")
+            group = wrapper + compiled.groups
+
+        self.pattern = re.compile('|'.join(alternatives)) if alternatives else None
+
+    @staticmethod
+    def _compile_template(template, wrapper, group_count):
+        """치환 문자열을 [문자열 또는 전체 정규식 기준 그룹 번호] 목록으로 변환"""
+        parts = []
+        position = 0
+        for match in GROUP_REFERENCE.finditer(template):
+            number = int(match.group(1) or match.group(2))
+            if not 1 <= number <= group_count:
+                raise ValueError(f"없는 그룹 참조: {template}")
+            parts.append(template[position:match.start()])
+            parts.append(wrapper + number)
+            position = match.end()
+        parts.append(template[position:])
+        return [part for part in parts if part != ""]
+
+    @staticmethod
+    def _compile_sequence(rules):
+        """구간 안에서 순서대로 적용할 규칙 목록을 구간 문자열 → 결과 문자열 함수로 변환"""
+        steps = []
+        for rule in rules:
+            compiled = re.compile(rule["pattern"])
+            if "function" in rule:
+                function = REPLACE_FUNCTIONS[rule["function"]]
+                steps.append((compiled, lambda match, function=function: function(*match.groups(""))))
+            else:
+                steps.append((compiled, rule.get("replace", "")))
+
+        def apply_sequence(span):
+            for compiled, replacement in steps:
+                span = compiled.sub(replacement, span)
+            return span
+        return apply_sequence
+
+    def _replace(self, match):
+        # 규칙을 감싼 그룹이 가장 늦게 닫히므로 lastindex가 맞은 규칙의 그룹 번호
+        kind, handler, groups = self.handlers[match.lastindex]
+        if kind == "sequence":
+            return handler(match.group(match.lastindex))
+        if kind == "function":
+            return handler(*(match.group(g) or "" for g in groups))
+        return ''.join(part if isinstance(part, str) else (match.group(part) or "") for part in handler)
+
+    def apply(self, text):
+        if self.chars:
+            text = text.translate(self.chars)
+        if self.pattern:
+            text = self.pattern.sub(self._replace, text)
+        return text
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """규칙 표 파일을 읽어서 {단계 이름: RuleStage} 반환"""
+    with open(path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    return {name: RuleStage(stage.get("chars"), stage.get("rules", [])) for name, stage in table.items()}